@@ -0,0 +1,23 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+QUERY_CANCELED_PGCODE = "57014"
+
+
+@contextmanager
+def statement_timeout(
+    milliseconds: int, using: str = DEFAULT_DB_ALIAS
+) -> Iterator[None]:
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %s, true)",
+                [str(milliseconds)],
+            )
+        yield
+
+
+def is_statement_timeout(exc: OperationalError) -> bool:
+    return getattr(exc.__cause__, "pgcode", None) == QUERY_CANCELED_PGCODE
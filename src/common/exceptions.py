@@ -7,3 +7,21 @@ class BaseServiceException(APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_detail = _("Service exception is occurred")
     default_code = "error"
+
+
+class InvalidCursorError(BaseServiceException):
+    default_detail = _("Invalid cursor")
+
+
+class InvalidIdempotencyKeyError(BaseServiceException):
+    default_detail = _("Invalid Idempotency-Key")
+
+
+class IdempotencyKeyInUseError(BaseServiceException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _("A request with this Idempotency-Key is still being processed")
+
+
+class IdempotencyKeyMismatchError(BaseServiceException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _("Idempotency-Key was already used with a different request")
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import time
+from collections.abc import Callable
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ..core.settings import (
+    IDEMPOTENCY_KEY_TTL,
+    IDEMPOTENCY_LOCK_TTL,
+    IDEMPOTENCY_WAIT_TIMEOUT,
+)
+from .exceptions import (
+    IdempotencyKeyInUseError,
+    IdempotencyKeyMismatchError,
+    InvalidIdempotencyKeyError,
+)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL_SECONDS = 0.05
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+
+
+def _storage_key(request: Request, key: str, vary: tuple[str, ...]) -> str:
+    scope = (
+        request.method,
+        request.path,
+        request.user.pk if request.user.is_authenticated else None,
+        key,
+        *(request.headers.get(header) for header in vary),
+    )
+    digest = hashlib.sha256(repr(scope).encode("utf-8")).hexdigest()
+    return f"idempotency:{digest}"
+
+
+def _fingerprint(request: Request) -> str:
+    payload = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _replay(record: dict) -> Response:
+    response = Response(
+        data=record["data"],
+        status=record["status"],
+        headers=record["headers"],
+    )
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _wait_for(storage_key: str, fingerprint: str) -> dict | None:
+    # Another request with the same key is running; its response is reused
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL_SECONDS)
+        record = cache.get(storage_key)
+        if record is None:
+            # The first request failed and released the key
+            return None
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyKeyMismatchError
+        if record["state"] == COMPLETED:
+            return record
+    raise IdempotencyKeyInUseError
+
+
+# Headers listed in vary are part of the key scope, so the same key sent
+# with a different value of one of them is a separate request
+def idempotent(vary: tuple[str, ...] = ()) -> Callable:
+    def decorator(handler: Callable) -> Callable:
+        @wraps(handler)
+        def wrapper(view, request: Request, *args, **kwargs) -> Response:
+            key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+            if key is None:
+                return handler(view, request, *args, **kwargs)
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise InvalidIdempotencyKeyError
+
+            storage_key = _storage_key(request, key, vary)
+            fingerprint = _fingerprint(request)
+            while not cache.add(
+                storage_key,
+                {"state": PROCESSING, "fingerprint": fingerprint},
+                timeout=IDEMPOTENCY_LOCK_TTL,
+            ):
+                record = cache.get(storage_key)
+                if record is None:
+                    continue
+                if record["fingerprint"] != fingerprint:
+                    raise IdempotencyKeyMismatchError
+                if record["state"] == PROCESSING:
+                    record = _wait_for(storage_key, fingerprint)
+                    if record is None:
+                        continue
+                return _replay(record)
+
+            try:
+                response = handler(view, request, *args, **kwargs)
+            except APIException as exc:
+                if exc.status_code >= 500:
+                    cache.delete(storage_key)
+                    raise
+                response = view.handle_exception(exc)
+            except Exception:
+                cache.delete(storage_key)
+                raise
+
+            if response.status_code >= 500:
+                cache.delete(storage_key)
+                return response
+            cache.set(
+                storage_key,
+                {
+                    "state": COMPLETED,
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "data": response.data,
+                    "headers": dict(response.items()),
+                },
+                timeout=IDEMPOTENCY_KEY_TTL,
+            )
+            return response
+
+        return wrapper
+
+    return decorator
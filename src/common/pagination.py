@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, QuerySet
+from django.db.models.fields.tuple_lookups import (
+    Tuple,
+    TupleGreaterThan,
+    TupleLessThan,
+)
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .exceptions import InvalidCursorError
+
+
+class KeysetPagination:
+    position_field: str = ""
+    tiebreak_field: str = "id"
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    total_query_param = "with_total"
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = 100
+
+    def __init__(self):
+        self.limit = self.default_limit
+        self.total = None
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def is_descending(self, request: Request) -> bool:
+        return True
+
+    def get_count(self, queryset: QuerySet) -> int:
+        return queryset.count()
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request) -> list:
+        self.limit = self.get_limit(request)
+        cursor = self.decode_cursor(queryset, request)
+
+        if self.wants_total(request):
+            self.total = self.get_count(queryset)
+
+        reverse = cursor["reverse"] if cursor else False
+        descending = self.is_descending(request) != reverse
+
+        queryset = queryset.order_by(*self.get_ordering(descending))
+        if cursor:
+            queryset = queryset.filter(self.get_position_filter(cursor, descending))
+
+        rows = list(queryset[: self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[: self.limit]
+        if reverse:
+            rows.reverse()
+
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else cursor is not None
+
+        if rows and has_next:
+            self.next_cursor = self.encode_cursor(rows[-1], reverse=False)
+        if rows and has_previous:
+            self.previous_cursor = self.encode_cursor(rows[0], reverse=True)
+
+        return rows
+
+    def get_pagination_data(self) -> dict[str, Any]:
+        pagination = {
+            "limit": self.limit,
+            "next": self.next_cursor,
+            "previous": self.previous_cursor,
+        }
+        if self.total is not None:
+            pagination["total"] = self.total
+        return pagination
+
+    def get_limit(self, request: Request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def wants_total(self, request: Request) -> bool:
+        value = request.query_params.get(self.total_query_param, "")
+        return value.lower() in ("1", "true", "yes")
+
+    def get_ordering(self, descending: bool) -> tuple[str, str]:
+        prefix = "-" if descending else ""
+        return f"{prefix}{self.position_field}", f"{prefix}{self.tiebreak_field}"
+
+    def get_position_filter(self, cursor: dict, descending: bool):
+        # A row comparison is an index range condition, unlike the equivalent
+        # OR, so a page never rescans rows sharing the cursor's position
+        lookup = TupleLessThan if descending else TupleGreaterThan
+        return lookup(
+            Tuple(F(self.position_field), F(self.tiebreak_field)),
+            (cursor["position"], cursor["tiebreak"]),
+        )
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        position = getattr(row, self.position_field)
+        tiebreak = getattr(row, self.tiebreak_field)
+        payload = [
+            position.isoformat() if hasattr(position, "isoformat") else str(position),
+            str(tiebreak),
+            int(reverse),
+        ]
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, queryset: QuerySet, request: Request) -> dict | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+            position, tiebreak, reverse = json.loads(raw)
+            opts = queryset.model._meta
+            return {
+                "position": opts.get_field(self.position_field).to_python(position),
+                "tiebreak": opts.get_field(self.tiebreak_field).to_python(tiebreak),
+                "reverse": bool(reverse),
+            }
+        except (
+            binascii.Error,
+            UnicodeError,
+            ValueError,
+            TypeError,
+            ValidationError,
+        ) as exc:
+            raise InvalidCursorError from exc
@@ -0,0 +1,10 @@
+from functools import lru_cache
+
+import redis
+
+from ..core.settings import REDIS_URL
+
+
+@lru_cache
+def get_redis_client() -> redis.Redis:
+    return redis.Redis.from_url(REDIS_URL)
@@ -3,18 +3,20 @@ from typing import Any
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 
+from ..core.settings import API_RESPONSE_VALIDATION
 from .serializer import APIResponseSerializer
 
 
 def api_response_factory(
     *,
     serializer_class: Serializer | None = None,
+    data: Any = None,
     meta: dict[str, Any] | None = None,
     errors: list[dict[str, Any]] | None = None,
     pagination: dict[str, Any] | None = None,
     status_code=None,
 ) -> Response:
-    serialized_data = None
+    serialized_data = data
     if serializer_class:
         try:
             serialized_data = serializer_class.data
@@ -30,12 +32,8 @@ def api_response_factory(
     if pagination:
         response_data["pagination"] = pagination
 
-    api_response_serializer = APIResponseSerializer(data=response_data)
-    if api_response_serializer.is_valid(raise_exception=True):
-        return Response(
-            data=api_response_serializer.validated_data,
-            status=status_code,
-        )
+    if API_RESPONSE_VALIDATION:
+        APIResponseSerializer(data=response_data).is_valid(raise_exception=True)
 
     return Response(
         data=response_data,
@@ -2,8 +2,13 @@ from rest_framework import serializers
 
 
 class PaginationSerializer(serializers.Serializer):
-    offset = serializers.IntegerField(default=0, required=False)
+    offset = serializers.IntegerField(required=False)
     limit = serializers.IntegerField(default=0, required=False)
+    total = serializers.IntegerField(required=False, allow_null=True)
+    total_strategy = serializers.CharField(required=False)
+    total_cached = serializers.BooleanField(required=False)
+    next = serializers.CharField(required=False, allow_null=True)
+    previous = serializers.CharField(required=False, allow_null=True)
 
 
 class APIResponseSerializer(serializers.Serializer):
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 from pathlib import Path
+from urllib.parse import quote
 
 from celery.schedules import crontab
 from kombu import Queue
@@ -68,6 +69,10 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# Re-validate every response envelope against APIResponseSerializer.
+# Meant for development and tests only: it walks every nested value.
+API_RESPONSE_VALIDATION = env.bool("API_RESPONSE_VALIDATION", default=False)
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
@@ -122,6 +127,25 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/#redis
+
+REDIS_HOST = env("REDIS_HOST", default="localhost")
+REDIS_PORT = env.int("REDIS_PORT", default=6379)
+REDIS_DB = env.int("REDIS_DB", default=0)
+REDIS_PASSWORD = env("REDIS_PASSWORD", default="")
+REDIS_URL = (
+    f"redis://:{quote(REDIS_PASSWORD, safe='')}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -173,17 +197,54 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(minute="*"),
         "args": (7,),
     },
+    "close-expired-events": {
+        "task": "tasks.close_expired_events",
+        "schedule": crontab(minute="*"),
+    },
+    "promote-waitlist": {
+        "task": "tasks.promote_waitlist",
+        "schedule": crontab(minute="*"),
+    },
 }
 
 CELERY_TASK_DEFAULT_QUEUE = "default"
 CELERY_TASK_QUEUES = (
     Queue("default"),
     Queue("periodic"),
+    Queue("registrations"),
 )
 CELERY_TASK_ROUTES = {
     "tasks.delete_old_events": {"queue": "periodic"},
+    "tasks.close_expired_events": {"queue": "periodic"},
+    "tasks.promote_waitlist": {"queue": "periodic"},
+    "tasks.register_visitor": {"queue": "registrations"},
 }
 
+EVENTS_AUTOCOMPLETE_TIMEOUT_MS = env.int("EVENTS_AUTOCOMPLETE_TIMEOUT_MS", default=150)
+EVENTS_AUTOCOMPLETE_CACHE_TTL = env.int("EVENTS_AUTOCOMPLETE_CACHE_TTL", default=60)
+EVENTS_LIST_CACHE_TTL = env.int("EVENTS_LIST_CACHE_TTL", default=300)
+EVENTS_LIST_MAX_AGE = env.int("EVENTS_LIST_MAX_AGE", default=5)
+EVENTS_EXACT_COUNT_THRESHOLD = env.int("EVENTS_EXACT_COUNT_THRESHOLD", default=10000)
+EVENTS_COUNT_CACHE_TTL = env.int("EVENTS_COUNT_CACHE_TTL", default=30)
+EVENTS_EXPORT_CHUNK_SIZE = env.int("EVENTS_EXPORT_CHUNK_SIZE", default=2000)
+EVENTS_BULK_MAX_ITEMS = env.int("EVENTS_BULK_MAX_ITEMS", default=2000)
+EVENTS_GROUP_MAX_VISITORS = env.int("EVENTS_GROUP_MAX_VISITORS", default=50)
+EVENTS_SEAT_SHARDS = env.int("EVENTS_SEAT_SHARDS", default=8)
+EVENTS_WAITING_ROOM_MAX_QUEUE = env.int("EVENTS_WAITING_ROOM_MAX_QUEUE", default=50000)
+EVENTS_WAITING_ROOM_TOKEN_TTL = env.int("EVENTS_WAITING_ROOM_TOKEN_TTL", default=900)
+EVENTS_BLOOM_CAPACITY = env.int("EVENTS_BLOOM_CAPACITY", default=100000)
+EVENTS_BLOOM_ERROR_RATE = env.float("EVENTS_BLOOM_ERROR_RATE", default=0.01)
+EVENTS_REGISTRATION_TICKET_TTL = env.int(
+    "EVENTS_REGISTRATION_TICKET_TTL",
+    default=3600,
+)
+EVENTS_CLOSE_BATCH_SIZE = env.int("EVENTS_CLOSE_BATCH_SIZE", default=1000)
+EVENTS_WAITLIST_BATCH_SIZE = env.int("EVENTS_WAITLIST_BATCH_SIZE", default=500)
+
+IDEMPOTENCY_KEY_TTL = env.int("IDEMPOTENCY_KEY_TTL", default=86400)
+IDEMPOTENCY_LOCK_TTL = env.int("IDEMPOTENCY_LOCK_TTL", default=60)
+IDEMPOTENCY_WAIT_TIMEOUT = env.int("IDEMPOTENCY_WAIT_TIMEOUT", default=10)
+
 NOTIFICATION_SERVICE_URL = env("NOTIFICATION_SERVICE_URL")
 NOTIFICATION_TOKEN = env("NOTIFICATION_TOKEN")
 NOTIFICATION_SERVICE_OWNER_ID = env("NOTIFICATION_SERVICE_OWNER_ID")
@@ -1,11 +1,39 @@
-from django.contrib import admin
+from functools import partial
+
+from django import forms
+from django.contrib import admin, messages
+from django.db import transaction
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils.translation import gettext_lazy as _
 
-from .models import EventAreaModel, EventModel, VisitorModel
+from ..common.exceptions import BaseServiceException
+from ..core.settings import EVENTS_SEAT_SHARDS, EVENTS_WAITLIST_BATCH_SIZE
+from .bloom import RegistrationBloomFilter
+from .cache import EventsCache
+from .ioc_container import get_container
+from .models import EventAreaModel, EventModel, VisitorModel, WaitlistEntryModel
+from .repository import EventSeatRepository
+from .services import VisitorImportService, WaitlistService
+
+
+class EventsCacheInvalidationMixin:
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        EventsCache().bump_version_on_commit()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        EventsCache().bump_version_on_commit()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        EventsCache().bump_version_on_commit()
 
 
 @admin.register(EventAreaModel)
-class EventAreaAdmin(admin.ModelAdmin):
+class EventAreaAdmin(EventsCacheInvalidationMixin, admin.ModelAdmin):
     list_display = ("name", "created_at", "updated_at", "event_count")
     list_filter = ("created_at", "updated_at")
     search_fields = ("name",)
@@ -42,8 +70,33 @@ class EventAreaInline(admin.TabularInline):
     readonly_fields = ("created_at", "updated_at")
 
 
+class SeatRebalanceMixin:
+    def rebalance_seats(self, event_ids) -> None:
+        repository = EventSeatRepository()
+        event_ids = list(set(event_ids))
+        for event_id in event_ids:
+            repository.rebalance(event_id=event_id, shards=EVENTS_SEAT_SHARDS)
+        # Freed seats go to the waitlist first, without waiting for the
+        # periodic promotion
+        waitlist_service = get_container().resolve(WaitlistService)
+        transaction.on_commit(
+            partial(
+                waitlist_service.promote,
+                batch_size=EVENTS_WAITLIST_BATCH_SIZE,
+                event_ids=event_ids,
+            ),
+        )
+
+
+class VisitorImportForm(forms.Form):
+    csv_file = forms.FileField(
+        label=_("CSV file"),
+        help_text=_("A 'full_name,email' header followed by one visitor per row"),
+    )
+
+
 @admin.register(EventModel)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(SeatRebalanceMixin, EventsCacheInvalidationMixin, admin.ModelAdmin):
     list_display = (
         "name",
         "area",
@@ -58,6 +111,7 @@ class EventAdmin(admin.ModelAdmin):
     ordering = ("-event_datetime", "name")
     date_hierarchy = "event_datetime"
     autocomplete_fields = ("area",)
+    actions = ("import_visitors_action",)
 
     fieldsets = (
         (
@@ -69,7 +123,7 @@ class EventAdmin(admin.ModelAdmin):
         (
             _("Event Details"),
             {
-                "fields": ("status", "event_datetime"),
+                "fields": ("status", "event_datetime", "capacity", "admission_rate"),
             },
         ),
         (
@@ -85,12 +139,122 @@ class EventAdmin(admin.ModelAdmin):
         queryset = super().get_queryset(request)
         return queryset.select_related("area")
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change or "capacity" in form.changed_data:
+            self.rebalance_seats([obj.pk])
+
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/import-visitors/",
+                self.admin_site.admin_view(self.import_visitors_view),
+                name="events_eventmodel_import_visitors",
+            ),
+            *super().get_urls(),
+        ]
+
+    @admin.action(description=_("Import visitors from CSV"))
+    def import_visitors_action(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(
+                request,
+                _("Select exactly one event to import visitors into."),
+                messages.WARNING,
+            )
+            return None
+        return HttpResponseRedirect(
+            reverse(
+                "admin:events_eventmodel_import_visitors",
+                args=[queryset.get().pk],
+            )
+        )
+
+    def import_visitors_view(self, request, object_id):
+        obj = self.get_object(request, object_id)
+        if obj is None or not self.has_change_permission(request, obj):
+            return self._get_obj_does_not_exist_redirect(request, self.opts, object_id)
+
+        form = VisitorImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            service = get_container().resolve(VisitorImportService)
+            try:
+                result = service.import_csv(
+                    event_id=obj.pk,
+                    stream=form.cleaned_data["csv_file"],
+                )
+            except BaseServiceException as exc:
+                self.message_user(request, str(exc.detail), messages.ERROR)
+            else:
+                self.message_user(
+                    request,
+                    _(
+                        "Imported %(imported)s of %(rows)s rows: %(invalid)s "
+                        "invalid, %(duplicates)s already registered or repeated, "
+                        "%(over_capacity)s over capacity."
+                    )
+                    % {
+                        "imported": result.imported,
+                        "rows": result.rows,
+                        "invalid": result.invalid,
+                        "duplicates": result.duplicates,
+                        "over_capacity": result.over_capacity,
+                    },
+                    messages.SUCCESS,
+                )
+                return HttpResponseRedirect(
+                    reverse("admin:events_eventmodel_change", args=[obj.pk])
+                )
+
+        return TemplateResponse(
+            request,
+            "admin/events/import_visitors.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": _("Import visitors"),
+                "opts": self.opts,
+                "original": obj,
+                "form": form,
+            },
+        )
+
 
 @admin.register(VisitorModel)
-class VisitorAdmin(admin.ModelAdmin):
+class VisitorAdmin(SeatRebalanceMixin, admin.ModelAdmin):
     list_display = ("full_name", "email", "event_id", "registered_at")
     search_fields = ("full_name", "email", "event_id__name")
     list_filter = ("event_id", "registered_at")
     readonly_fields = ("id", "registered_at", "updated_at")
     autocomplete_fields = ("event_id",)
     ordering = ("-registered_at",)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        previous = form.initial.get("event_id")
+        self.rebalance_seats([obj.event_id_id, *([previous] if previous else [])])
+        if previous and previous != obj.event_id_id:
+            # A Bloom filter cannot forget an email, it is rebuilt on demand
+            RegistrationBloomFilter().invalidate([previous])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self.rebalance_seats([obj.event_id_id])
+        RegistrationBloomFilter().invalidate([obj.event_id_id])
+
+    def delete_queryset(self, request, queryset):
+        event_ids = list(
+            queryset.order_by().values_list("event_id", flat=True).distinct()
+        )
+        super().delete_queryset(request, queryset)
+        self.rebalance_seats(event_ids)
+        RegistrationBloomFilter().invalidate(event_ids)
+
+
+@admin.register(WaitlistEntryModel)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ("full_name", "email", "event", "created_at")
+    search_fields = ("full_name", "email", "event__name")
+    list_filter = ("event", "created_at")
+    readonly_fields = ("id", "created_at")
+    autocomplete_fields = ("event",)
+    ordering = ("id",)
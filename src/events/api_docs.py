@@ -1,4 +1,5 @@
 from django.utils.translation import gettext_lazy as _
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
@@ -15,8 +16,26 @@ from .serializers import (
     SignUpForEventRequestSerializer,
 )
 
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name="Idempotency-Key",
+    type=str,
+    location=OpenApiParameter.HEADER,
+    description=_(
+        "Client-generated key (e.g. a UUID) that makes retries safe: a repeat "
+        "with the same key and body returns the stored response with "
+        "'Idempotent-Replayed: true', a concurrent repeat waits for the first "
+        "request, and the same key with a different body is rejected with 422.",
+    ),
+    required=False,
+)
+
 get_events_docs = extend_schema(
-    description=_("Retrieve a list of available events."),
+    description=_(
+        "Retrieve a list of available events. 'pagination.total' is an exact "
+        "count for small results and a planner estimate for large ones, as "
+        "reported by 'pagination.total_strategy'; 'pagination.total_cached' "
+        "marks a total reused from a recent request with the same filter.",
+    ),
     tags=["Events"],
     methods=["GET"],
     summary=_("List events"),
@@ -52,6 +71,79 @@ get_events_docs = extend_schema(
             required=False,
             enum=["asc", "desc"],
         ),
+        OpenApiParameter(
+            name="pagination",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Pagination mode. 'cursor' switches to keyset pagination on "
+                "(event_datetime, id); default is limit/offset.",
+            ),
+            required=False,
+            enum=["offset", "cursor"],
+        ),
+        OpenApiParameter(
+            name="cursor",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Opaque cursor from 'pagination.next' or 'pagination.previous'. "
+                "Implies cursor pagination.",
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="with_total",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description=_("Include the total count in cursor pagination mode."),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="area_id",
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description=_("Only return events held in this area."),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="date_from",
+            type=OpenApiTypes.DATE,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Only return events on or after this day (MM.DD.YYYY or YYYY-MM-DD).",
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="date_to",
+            type=OpenApiTypes.DATE,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Only return events on or before this day (MM.DD.YYYY or YYYY-MM-DD).",
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="upcoming",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Only return events that have not started yet (to the minute). "
+                "Default order becomes 'asc', soonest first.",
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="If-None-Match",
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description=_(
+                "ETag of a previously received list. A 304 without a body is "
+                "returned while the list is unchanged.",
+            ),
+            required=False,
+        ),
     ],
     responses={
         status.HTTP_200_OK: OpenApiResponse(
@@ -85,12 +177,150 @@ get_events_docs = extend_schema(
                             "offset": 0,
                             "limit": 10,
                             "total": 18,
+                            "total_strategy": "exact",
+                            "total_cached": False,
+                        },
+                    },
+                    response_only=True,
+                ),
+                OpenApiExample(
+                    name="Events list (cursor pagination)",
+                    value={
+                        "data": [
+                            {
+                                "id": "ae764a1e-5960-4f70-b39b-9a2dbce9c2cf",
+                                "name": "Tech Conference 2025",
+                                "area": "Main Hall",
+                                "status": "open",
+                                "event_datetime": "01.13.2026",
+                                "registration_deadline": "01.13.2026",
+                            },
+                        ],
+                        "meta": {},
+                        "errors": [],
+                        "pagination": {
+                            "limit": 1,
+                            "next": "WyIyMDI2LTAxLTEzVDAwOjAwOjAwKzAwOjAwIiwiYWU3NjRh",
+                            "previous": None,
                         },
                     },
                     response_only=True,
                 ),
             ],
         ),
+        status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+            description=_("The list matching 'If-None-Match' has not changed."),
+        ),
+    },
+)
+
+
+event_autocomplete_docs = extend_schema(
+    description=_(
+        "Suggest open events and event areas whose name has a word starting "
+        "with, or similar to, the given text. Each lookup runs under a latency "
+        "budget; 'meta.partial' is set when a lookup was cut short.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("Autocomplete events and areas"),
+    parameters=[
+        OpenApiParameter(
+            name="q",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_("Text typed so far."),
+            required=True,
+        ),
+        OpenApiParameter(
+            name="limit",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description=_("Maximum number of suggestions per group (1-20)."),
+            required=False,
+        ),
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description=_("Suggestions found."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Suggestions",
+                    value={
+                        "data": {
+                            "events": [
+                                {
+                                    "id": "ae764a1e-5960-4f70-b39b-9a2dbce9c2cf",
+                                    "name": "Tech Conference 2025",
+                                },
+                            ],
+                            "areas": [],
+                        },
+                        "meta": {},
+                        "errors": [],
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: OpenApiResponse(
+            description=_("Validation failed."),
+            response=dict,
+        ),
+    },
+)
+
+
+export_events_docs = extend_schema(
+    description=_(
+        "Stream every open event as NDJSON (one JSON object per line) or CSV. "
+        "Rows are read through a server-side cursor, so the full catalogue "
+        "can be pulled in one request instead of paging through the list.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("Export open events"),
+    parameters=[
+        OpenApiParameter(
+            name="export_format",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_("Output format. Default is 'ndjson'."),
+            required=False,
+            enum=["ndjson", "csv"],
+        ),
+        OpenApiParameter(
+            name="name",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_("Filter events by name (full-text match)."),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="order_by",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Sort events by event_datetime. Use 'asc' for ascending or 'desc' for descending. Default is 'desc'.",
+            ),
+            required=False,
+            enum=["asc", "desc"],
+        ),
+    ],
+    responses={
+        (status.HTTP_200_OK, "application/x-ndjson"): OpenApiResponse(
+            description=_("Open events, one JSON object per line."),
+            response=str,
+        ),
+        (status.HTTP_200_OK, "text/csv"): OpenApiResponse(
+            description=_("Open events as CSV with a header row."),
+            response=str,
+        ),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: OpenApiResponse(
+            description=_("Validation failed."),
+            response=dict,
+        ),
     },
 )
 
@@ -99,6 +329,7 @@ create_event_docs = extend_schema(
     description=_("Create a new event in a specific event area."),
     tags=["Events"],
     methods=["POST"],
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
     summary=_("Create event"),
     request=EventRequestSerializer,
     examples=[
@@ -110,6 +341,7 @@ create_event_docs = extend_schema(
                 "status": "open",
                 "event_datetime": "01.13.2026",
                 "registration_deadline": "01.13.2026",
+                "capacity": 500,
             },
             request_only=True,
         ),
@@ -164,10 +396,94 @@ create_event_docs = extend_schema(
     },
 )
 
+bulk_create_events_docs = extend_schema(
+    description=_(
+        "Create many events in one request. Items are validated one by one, "
+        "areas are checked in a single query and all valid items are inserted "
+        "together. Every item gets a result in 'data', in request order; "
+        "'meta' counts created and failed items.",
+    ),
+    tags=["Events"],
+    methods=["POST"],
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    summary=_("Create events in bulk"),
+    request=EventRequestSerializer(many=True),
+    examples=[
+        OpenApiExample(
+            name="Example request",
+            value=[
+                {
+                    "name": "Tech Conference 2025",
+                    "area_id": "1c74b3ec-b651-4775-88b6-8b21f37fc3f4",
+                    "event_datetime": "01.13.2026",
+                    "registration_deadline": "01.12.2026",
+                },
+                {
+                    "name": "Opening Party",
+                    "event_datetime": "01.01.2020",
+                    "registration_deadline": "01.01.2020",
+                },
+            ],
+            request_only=True,
+        ),
+    ],
+    responses={
+        status.HTTP_201_CREATED: OpenApiResponse(
+            description=_("All events created."),
+            response=dict,
+        ),
+        status.HTTP_207_MULTI_STATUS: OpenApiResponse(
+            description=_("Some events created, some failed."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Partial success",
+                    value={
+                        "data": [
+                            {
+                                "index": 0,
+                                "status": "created",
+                                "event": {
+                                    "id": "ae764a1e-5960-4f70-b39b-9a2dbce9c2cf",
+                                    "name": "Tech Conference 2025",
+                                    "area": "Main Hall",
+                                    "status": "open",
+                                    "event_datetime": "01.13.2026",
+                                    "registration_deadline": "01.12.2026",
+                                },
+                            },
+                            {
+                                "index": 1,
+                                "status": "failed",
+                                "errors": [
+                                    {
+                                        "field": "event_datetime",
+                                        "messages": [
+                                            "Event datetime cannot be in the past.",
+                                        ],
+                                    },
+                                ],
+                            },
+                        ],
+                        "meta": {"created": 1, "failed": 1},
+                        "errors": [],
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: OpenApiResponse(
+            description=_("No event could be created."),
+            response=dict,
+        ),
+    },
+)
+
 create_event_area_docs = extend_schema(
     description=_("Create a new event area that can be used to group events."),
     tags=["Areas"],
     methods=["POST"],
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
     summary=_("Create event area"),
     request=EventAreaRequestSerializer,
     examples=[
@@ -237,9 +553,47 @@ create_event_area_docs = extend_schema(
     },
 )
 
+QUEUE_TOKEN_PARAMETER = OpenApiParameter(
+    name="X-Queue-Token",
+    type=str,
+    location=OpenApiParameter.HEADER,
+    description=_("Waiting room token returned by a queued registration."),
+    required=False,
+)
+
+QUEUED_EXAMPLE = OpenApiExample(
+    name="Queued",
+    value={
+        "data": {
+            "admitted": False,
+            "token": "WyI4ZjE0...:1uQ2xb:Yk3n...",
+            "position": 1250,
+            "retry_after": 13,
+        },
+        "meta": {"message": "Waiting for admission"},
+        "errors": [],
+    },
+    response_only=True,
+)
+
+WAITLIST_EXAMPLE_DATA = {
+    "event_id": "8f14e45f-ceea-467f-a0e6-7a1c2b7d5c11",
+    "email": "john.doe@example.com",
+    "position": 3,
+}
+
+TICKET_EXAMPLE_DATA = {
+    "ticket_id": "5f0c2a53-8d3e-4b8e-9a43-0c1c2f5d1e77",
+    "event_id": "8f14e45f-ceea-467f-a0e6-7a1c2b7d5c11",
+    "status": "pending",
+    "error": None,
+}
+
 sign_up_for_event_docs = extend_schema(
     description=_(
-        "Register a visitor for a specific event by providing their full name and email.",
+        "Register a visitor for a specific event by providing their full name and "
+        "email. When the event is full the visitor joins its waitlist instead "
+        "and is registered, first come first served, once a seat frees up.",
     ),
     tags=["Events"],
     methods=["POST"],
@@ -252,6 +606,19 @@ sign_up_for_event_docs = extend_schema(
             description=_("UUID of the event to register for."),
             required=True,
         ),
+        QUEUE_TOKEN_PARAMETER,
+        OpenApiParameter(
+            name="Prefer",
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description=_(
+                "Send 'respond-async' to get 202 with a registration ticket "
+                "right after validation; the registration itself is processed "
+                "by a background worker.",
+            ),
+            required=False,
+        ),
+        IDEMPOTENCY_KEY_PARAMETER,
     ],
     request=SignUpForEventRequestSerializer,
     examples=[
@@ -280,6 +647,49 @@ sign_up_for_event_docs = extend_schema(
                 ),
             ],
         ),
+        status.HTTP_202_ACCEPTED: OpenApiResponse(
+            description=_(
+                "Either the event has a waiting room and the request is queued "
+                "(poll the queue status with the returned X-Queue-Token and "
+                "repeat the registration with it once admitted), or "
+                "'Prefer: respond-async' was sent and the registration was "
+                "accepted for processing (follow the Location header), or the "
+                "event is full and the visitor was added to its waitlist.",
+            ),
+            response=dict,
+            examples=[
+                QUEUED_EXAMPLE,
+                OpenApiExample(
+                    name="Added to the waitlist",
+                    value={
+                        "data": WAITLIST_EXAMPLE_DATA,
+                        "meta": {"message": "Event is full, added to the waitlist"},
+                        "errors": [],
+                    },
+                    response_only=True,
+                ),
+                OpenApiExample(
+                    name="Registration accepted",
+                    value={
+                        "data": TICKET_EXAMPLE_DATA,
+                        "meta": {"message": "Registration accepted"},
+                        "errors": [],
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        status.HTTP_503_SERVICE_UNAVAILABLE: OpenApiResponse(
+            description=_("The waiting room queue is full, see Retry-After."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Waiting room is full",
+                    value={"detail": "Waiting room is full, try again later"},
+                    response_only=True,
+                ),
+            ],
+        ),
         status.HTTP_400_BAD_REQUEST: OpenApiResponse(
             description=_("Bad request errors."),
             response=dict,
@@ -298,6 +708,20 @@ sign_up_for_event_docs = extend_schema(
                     },
                     response_only=True,
                 ),
+                OpenApiExample(
+                    name="Invalid or expired queue token",
+                    value={
+                        "detail": "Invalid or expired queue token",
+                    },
+                    response_only=True,
+                ),
+                OpenApiExample(
+                    name="Registration deadline has passed",
+                    value={
+                        "detail": "Registration deadline has passed",
+                    },
+                    response_only=True,
+                ),
             ],
         ),
         status.HTTP_422_UNPROCESSABLE_ENTITY: OpenApiResponse(
@@ -356,3 +780,400 @@ sign_up_for_event_docs = extend_schema(
         ),
     },
 )
+
+
+event_queue_status_docs = extend_schema(
+    description=_(
+        "Check the waiting room position of a queued registration without "
+        "touching the database. Once 'admitted' is true, repeat the "
+        "registration with the same X-Queue-Token.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("Waiting room status"),
+    parameters=[
+        OpenApiParameter(
+            name="event_id",
+            type=str,
+            location=OpenApiParameter.PATH,
+            description=_("UUID of the event the token was issued for."),
+            required=True,
+        ),
+        QUEUE_TOKEN_PARAMETER,
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description=_("Current position in the waiting room."),
+            response=dict,
+            examples=[QUEUED_EXAMPLE],
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            description=_("Missing, invalid or expired queue token."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Invalid or expired queue token",
+                    value={"detail": "Invalid or expired queue token"},
+                    response_only=True,
+                ),
+            ],
+        ),
+    },
+)
+
+
+registration_ticket_docs = extend_schema(
+    description=_(
+        "Check a registration accepted with 'Prefer: respond-async'. The "
+        "status is 'pending' until a worker processes it, then 'registered', "
+        "'waitlisted' when the event was full, or 'failed' with the error.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("Registration ticket status"),
+    parameters=[
+        OpenApiParameter(
+            name="ticket_id",
+            type=str,
+            location=OpenApiParameter.PATH,
+            description=_("Ticket id returned by the asynchronous registration."),
+            required=True,
+        ),
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description=_("Current ticket status."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Failed",
+                    value={
+                        "data": {
+                            **TICKET_EXAMPLE_DATA,
+                            "status": "failed",
+                            "error": "Registration already exists",
+                        },
+                        "meta": {},
+                        "errors": [],
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        status.HTTP_404_NOT_FOUND: OpenApiResponse(
+            description=_("Unknown or expired ticket."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Ticket not found",
+                    value={"detail": "Registration ticket not found or expired"},
+                    response_only=True,
+                ),
+            ],
+        ),
+    },
+)
+
+
+EVENT_ID_PARAMETER = OpenApiParameter(
+    name="event_id",
+    type=OpenApiTypes.UUID,
+    location=OpenApiParameter.PATH,
+    description=_("Event whose visitors to return."),
+    required=True,
+)
+
+VISITOR_ERROR_RESPONSES = {
+    status.HTTP_401_UNAUTHORIZED: OpenApiResponse(
+        description=_("Missing or invalid access token."),
+        response=dict,
+    ),
+    status.HTTP_403_FORBIDDEN: OpenApiResponse(
+        description=_("Only staff users can list visitors."),
+        response=dict,
+    ),
+    status.HTTP_404_NOT_FOUND: OpenApiResponse(
+        description=_("Unknown event."),
+        response=dict,
+        examples=[
+            OpenApiExample(
+                name="Event not found",
+                value={"detail": "Event not found"},
+                response_only=True,
+            ),
+        ],
+    ),
+}
+
+
+list_visitors_docs = extend_schema(
+    description=_(
+        "List the visitors registered for an event, newest first. Pages are "
+        "keyset-paginated on (registered_at, id), so every page costs the same "
+        "regardless of its depth. Staff only.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("List event visitors"),
+    parameters=[
+        EVENT_ID_PARAMETER,
+        OpenApiParameter(
+            name="limit",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description=_("Number of results to return per page (at most 100)."),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="cursor",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Opaque cursor from 'pagination.next' or 'pagination.previous'.",
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="with_total",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description=_("Include the total number of visitors."),
+            required=False,
+        ),
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description=_("A page of visitors."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Visitors",
+                    value={
+                        "data": [
+                            {
+                                "id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+                                "full_name": "Jane Doe",
+                                "email": "jane@example.com",
+                                "registered_at": "2026-10-18T09:30:00+00:00",
+                            },
+                        ],
+                        "meta": {},
+                        "errors": [],
+                        "pagination": {
+                            "limit": 10,
+                            "next": "WyIyMDI2LTEwLTE4VDA5OjMwOjAwKzAwOjAwIiwiMGY4ZiIsMF0",
+                            "previous": None,
+                        },
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        **VISITOR_ERROR_RESPONSES,
+    },
+)
+
+
+export_visitors_docs = extend_schema(
+    description=_(
+        "Stream every visitor of an event as CSV with a header row, newest "
+        "first. Rows are read through a server-side cursor, so large events "
+        "are exported in one request. Staff only.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("Export event visitors"),
+    parameters=[EVENT_ID_PARAMETER],
+    responses={
+        (status.HTTP_200_OK, "text/csv"): OpenApiResponse(
+            description=_("Visitors as CSV: id, full_name, email, registered_at."),
+            response=str,
+        ),
+        **VISITOR_ERROR_RESPONSES,
+    },
+)
+
+
+lookup_registrations_docs = extend_schema(
+    description=_(
+        "List every registration of one email address across events, newest "
+        "first, with the event name and date. The email is matched "
+        "case-insensitively, as emails are stored lowercase. Keyset-paginated "
+        "on (registered_at, id). Staff only.",
+    ),
+    tags=["Events"],
+    methods=["GET"],
+    summary=_("Look up registrations by email"),
+    parameters=[
+        OpenApiParameter(
+            name="email",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_("Visitor email address."),
+            required=True,
+        ),
+        OpenApiParameter(
+            name="limit",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description=_("Number of results to return per page (at most 100)."),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="cursor",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=_(
+                "Opaque cursor from 'pagination.next' or 'pagination.previous'.",
+            ),
+            required=False,
+        ),
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description=_("A page of registrations."),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Registrations",
+                    value={
+                        "data": [
+                            {
+                                "id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+                                "full_name": "Jane Doe",
+                                "email": "jane@example.com",
+                                "registered_at": "2026-10-18T09:30:00+00:00",
+                                "event": {
+                                    "id": "1c74b3ec-b651-4775-88b6-8b21f37fc3f4",
+                                    "name": "Tech Conference 2026",
+                                    "event_datetime": "2026-11-20T18:00:00+00:00",
+                                },
+                            },
+                        ],
+                        "meta": {},
+                        "errors": [],
+                        "pagination": {"limit": 10, "next": None, "previous": None},
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        status.HTTP_401_UNAUTHORIZED: VISITOR_ERROR_RESPONSES[
+            status.HTTP_401_UNAUTHORIZED
+        ],
+        status.HTTP_403_FORBIDDEN: VISITOR_ERROR_RESPONSES[status.HTTP_403_FORBIDDEN],
+        status.HTTP_422_UNPROCESSABLE_ENTITY: OpenApiResponse(
+            description=_("Missing or invalid email."),
+            response=dict,
+        ),
+    },
+)
+
+
+group_sign_up_for_event_docs = extend_schema(
+    description=_(
+        "Register several visitors for one event in a single transaction. The "
+        "event is checked once, the visitors are inserted with one multi-row "
+        "statement and seats are claimed for the whole group, in request "
+        "order; people left without a seat join the event's waitlist. Every "
+        "person gets a result in 'data', in request order; 'meta' counts "
+        "registered, waitlisted and failed people. The group passes the "
+        "waiting room as one sign-up.",
+    ),
+    tags=["Events"],
+    methods=["POST"],
+    summary=_("Sign up a group for event"),
+    parameters=[
+        OpenApiParameter(
+            name="event_id",
+            type=str,
+            location=OpenApiParameter.PATH,
+            description=_("UUID of the event to register for."),
+            required=True,
+        ),
+        QUEUE_TOKEN_PARAMETER,
+        IDEMPOTENCY_KEY_PARAMETER,
+    ],
+    request=SignUpForEventRequestSerializer(many=True),
+    examples=[
+        OpenApiExample(
+            name="Example request",
+            value=[
+                {"full_name": "John Doe", "email": "john.doe@example.com"},
+                {"full_name": "Jane Doe", "email": "jane.doe@example.com"},
+                {"full_name": "Jim Doe", "email": "jim.doe@example.com"},
+            ],
+            request_only=True,
+        ),
+    ],
+    responses={
+        status.HTTP_201_CREATED: OpenApiResponse(
+            description=_("Everyone registered."),
+            response=dict,
+        ),
+        status.HTTP_202_ACCEPTED: OpenApiResponse(
+            description=_(
+                "Queued in the event's waiting room; repeat with the "
+                "X-Queue-Token once admitted. Also returned when everyone was "
+                "added to the waitlist.",
+            ),
+            response=dict,
+        ),
+        status.HTTP_207_MULTI_STATUS: OpenApiResponse(
+            description=_(
+                "Mixed results: some people registered, waitlisted or failed.",
+            ),
+            response=dict,
+            examples=[
+                OpenApiExample(
+                    name="Partial success",
+                    value={
+                        "data": [
+                            {
+                                "index": 0,
+                                "status": "registered",
+                                "visitor": {
+                                    "id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+                                    "full_name": "John Doe",
+                                    "email": "john.doe@example.com",
+                                },
+                            },
+                            {
+                                "index": 1,
+                                "status": "failed",
+                                "errors": [
+                                    {
+                                        "field": "email",
+                                        "messages": ["Registration already exists"],
+                                    },
+                                ],
+                            },
+                            {
+                                "index": 2,
+                                "status": "waitlisted",
+                                "waitlist": {
+                                    **WAITLIST_EXAMPLE_DATA,
+                                    "email": "jim.doe@example.com",
+                                },
+                            },
+                        ],
+                        "meta": {"registered": 1, "waitlisted": 1, "failed": 1},
+                        "errors": [],
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            description=_(
+                "The event is closed or past its registration deadline, or the "
+                "list is empty or too long.",
+            ),
+            response=dict,
+        ),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: OpenApiResponse(
+            description=_("Nobody could be registered."),
+            response=dict,
+        ),
+    },
+)
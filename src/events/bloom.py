@@ -0,0 +1,127 @@
+import hashlib
+import math
+from collections.abc import Iterable
+from uuid import UUID
+
+from redis import RedisError
+
+from ..common.redis import get_redis_client
+from ..core.settings import EVENTS_BLOOM_CAPACITY, EVENTS_BLOOM_ERROR_RATE
+from .dto import BloomStatsDTO
+
+# Sets the bits only on a filter that was built from the visitors table, so a
+# lost or evicted filter is never replaced by one missing earlier emails
+ADD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for _, offset in ipairs(ARGV) do
+    redis.call('SETBIT', KEYS[1], offset, 1)
+end
+return 1
+"""
+
+
+class RegistrationBloomFilter:
+    prefix = "events:bloom"
+    stats_key = "events:bloom:stats"
+    ttl = 7 * 24 * 60 * 60
+    rebuild_lock_ttl = 60
+
+    def __init__(self):
+        self.client = get_redis_client()
+        self.add_script = self.client.register_script(ADD_SCRIPT)
+        # Optimal sizing for the expected registrations per event
+        self.size = math.ceil(
+            -EVENTS_BLOOM_CAPACITY
+            * math.log(EVENTS_BLOOM_ERROR_RATE)
+            / math.log(2) ** 2,
+        )
+        self.hashes = max(1, round(self.size / EVENTS_BLOOM_CAPACITY * math.log(2)))
+
+    def make_key(self, event_id: UUID) -> str:
+        return f"{self.prefix}:{event_id}"
+
+    def offsets(self, email: str) -> list[int]:
+        digest = hashlib.blake2b(email.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def might_contain(self, event_id: UUID, email: str) -> bool | None:
+        # None when there is no filter for the event yet
+        key = self.make_key(event_id)
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.exists(key)
+        for offset in self.offsets(email):
+            pipeline.getbit(key, offset)
+        try:
+            exists, *bits = pipeline.execute()
+        except RedisError:
+            return None
+        if not exists:
+            return None
+        if not all(bits):
+            self.record("negatives")
+            return False
+        return True
+
+    def add(self, event_id: UUID, email: str) -> None:
+        try:
+            self.add_script(keys=[self.make_key(event_id)], args=self.offsets(email))
+        except RedisError:
+            pass
+
+    def rebuild(self, event_id: UUID, emails: Iterable[str]) -> bool:
+        key = self.make_key(event_id)
+        lock_key = f"{key}:rebuild"
+        try:
+            if not self.client.set(lock_key, 1, nx=True, ex=self.rebuild_lock_ttl):
+                return False
+        except RedisError:
+            return False
+        try:
+            bitmap = bytearray(math.ceil(self.size / 8))
+            for email in emails:
+                for offset in self.offsets(email):
+                    # Redis bit 0 is the most significant bit of the first byte
+                    bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+            building_key = f"{key}:building"
+            pipeline = self.client.pipeline()
+            pipeline.set(building_key, bytes(bitmap), ex=self.ttl)
+            pipeline.rename(building_key, key)
+            pipeline.execute()
+        finally:
+            self.client.delete(lock_key)
+        return True
+
+    def invalidate(self, event_ids: Iterable[UUID]) -> None:
+        keys = [self.make_key(event_id) for event_id in event_ids]
+        if keys:
+            self.client.delete(*keys)
+
+    def record(self, outcome: str) -> None:
+        try:
+            self.client.hincrby(self.stats_key, outcome, 1)
+        except RedisError:
+            pass
+
+    def get_stats(self) -> BloomStatsDTO:
+        stats = {
+            field.decode(): int(value)
+            for field, value in self.client.hgetall(self.stats_key).items()
+        }
+        return BloomStatsDTO(
+            negatives=stats.get("negatives", 0),
+            duplicates=stats.get("duplicates", 0),
+            false_positives=stats.get("false_positives", 0),
+        )
+
+    def get_fill_ratio(self, event_id: UUID) -> float | None:
+        key = self.make_key(event_id)
+        if not self.client.exists(key):
+            return None
+        return self.client.bitcount(key) / self.size
+
+    def estimate_error_rate(self, fill_ratio: float) -> float:
+        return fill_ratio**self.hashes
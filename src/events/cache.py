@@ -0,0 +1,38 @@
+import hashlib
+import time
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class EventsCache:
+    prefix = "events"
+    version_key = "events:version"
+
+    def get_version(self) -> int:
+        version = cache.get(self.version_key)
+        if version is None:
+            # Seeded from the clock so a lost counter never reuses an old version
+            cache.add(self.version_key, time.time_ns() // 1000, timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def bump_version(self) -> None:
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            self.get_version()
+
+    def bump_version_on_commit(self) -> None:
+        transaction.on_commit(self.bump_version)
+
+    def make_key(self, namespace: str, *parts: Any) -> str:
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{namespace}:v{self.get_version()}:{digest}"
+
+    def get(self, key: str) -> Any:
+        return cache.get(key)
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        cache.set(key, value, timeout=timeout)
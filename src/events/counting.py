@@ -0,0 +1,43 @@
+from dataclasses import replace
+
+from django.db import connections
+from django.db.models import QuerySet
+
+from ..core.settings import EVENTS_COUNT_CACHE_TTL, EVENTS_EXACT_COUNT_THRESHOLD
+from .cache import EventsCache
+from .dto import TotalCountDTO
+
+
+class CountStrategy:
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+
+
+class EventsCounter:
+    def __init__(self, cache: EventsCache):
+        self.cache = cache
+
+    def count(self, queryset: QuerySet) -> TotalCountDTO:
+        queryset = queryset.order_by()
+        key = self.cache.make_key("count", *queryset.query.sql_with_params())
+        total = self.cache.get(key)
+        if total is not None:
+            return replace(total, cached=True)
+
+        estimate = self.estimate(queryset)
+        if estimate > EVENTS_EXACT_COUNT_THRESHOLD:
+            total = TotalCountDTO(value=estimate, strategy=CountStrategy.ESTIMATED)
+        else:
+            total = TotalCountDTO(value=queryset.count(), strategy=CountStrategy.EXACT)
+
+        self.cache.set(key, total, timeout=EVENTS_COUNT_CACHE_TTL)
+        return total
+
+    @staticmethod
+    def estimate(queryset: QuerySet) -> int:
+        # Planner row estimate, derived from pg_class.reltuples and column stats
+        sql, params = queryset.query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        return int(plan[0]["Plan"]["Plan Rows"])
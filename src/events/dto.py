@@ -9,7 +9,7 @@ class EventAreaDTO:
     id: UUID | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class EventDTO:
     name: str
     status: str
@@ -18,6 +18,44 @@ class EventDTO:
     id: UUID | None = None
     area: str | None = None
     area_id: UUID | None = None
+    capacity: int | None = None
+    admission_rate: int | None = None
+
+
+@dataclass(kw_only=True)
+class BulkItemResultDTO:
+    index: int
+    event: EventDTO | None = None
+    errors: dict | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class EventFilterDTO:
+    area_id: UUID | None = None
+    starts_from: datetime | None = None
+    starts_before: datetime | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class EventExportQueryDTO:
+    export_format: str
+    name: str | None = None
+    order_by: str | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class EventsStateDTO:
+    version: int
+    events_count: int
+    events_updated_at: datetime | None
+    areas_updated_at: datetime | None
+
+
+@dataclass(kw_only=True, frozen=True)
+class TotalCountDTO:
+    value: int
+    strategy: str
+    cached: bool = False
 
 
 @dataclass(kw_only=True)
@@ -26,3 +64,125 @@ class VisitorDTO:
     email: str
     event_id: UUID
     id: UUID | None = None
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class RegisteredVisitorDTO:
+    id: UUID
+    full_name: str
+    email: str
+    registered_at: datetime
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class VisitorRegistrationDTO:
+    id: UUID
+    full_name: str
+    email: str
+    registered_at: datetime
+    event_id: UUID
+    event_name: str
+    event_datetime: datetime
+
+
+@dataclass(kw_only=True, frozen=True)
+class AdmissionDTO:
+    admitted: bool
+    token: str | None = None
+    position: int = 0
+    retry_after: int = 0
+
+
+@dataclass(kw_only=True, frozen=True)
+class RegistrationTicketDTO:
+    id: UUID
+    event_id: UUID
+    status: str
+    error: str | None = None
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class WaitlistEntryDTO:
+    event_id: UUID
+    email: str
+    position: int
+
+
+@dataclass(kw_only=True, frozen=True)
+class SignUpResultDTO:
+    admission: AdmissionDTO
+    ticket: RegistrationTicketDTO | None = None
+    waitlist: WaitlistEntryDTO | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class GroupRegistrationResultDTO:
+    event_open: bool
+    limited: bool
+    deadline_passed: bool
+    queued: bool
+    created: set[UUID]
+
+
+@dataclass(kw_only=True)
+class GroupMemberResultDTO:
+    index: int
+    visitor: VisitorDTO | None = None
+    waitlist: WaitlistEntryDTO | None = None
+    errors: dict | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class GroupSignUpResultDTO:
+    admission: AdmissionDTO
+    members: list[GroupMemberResultDTO] | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class VisitorImportResultDTO:
+    rows: int
+    invalid: int
+    duplicates: int
+    over_capacity: int
+    imported: int
+
+
+@dataclass(kw_only=True, frozen=True)
+class BloomStatsDTO:
+    negatives: int
+    duplicates: int
+    false_positives: int
+
+    @property
+    def false_positive_rate(self) -> float:
+        # Share of new registrations the filter wrongly sent to the database
+        checked = self.negatives + self.false_positives
+        return self.false_positives / checked if checked else 0.0
+
+
+@dataclass(kw_only=True, frozen=True)
+class RegistrationResultDTO:
+    event_open: bool
+    created: bool
+    limited: bool = False
+    deadline_passed: bool = False
+    queued: bool = False
+
+
+@dataclass(kw_only=True, frozen=True)
+class SuggestionDTO:
+    id: UUID
+    name: str
+
+
+@dataclass(kw_only=True, frozen=True)
+class AutocompleteQueryDTO:
+    term: str
+    limit: int
+
+
+@dataclass(kw_only=True)
+class AutocompleteResultDTO:
+    events: list[SuggestionDTO]
+    areas: list[SuggestionDTO]
+    partial: bool = False
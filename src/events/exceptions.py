@@ -1,4 +1,5 @@
 from django.utils.translation import gettext_lazy as _
+from rest_framework import status
 
 from ..common.exceptions import BaseServiceException
 
@@ -7,5 +8,41 @@ class EventClosedError(BaseServiceException):
     default_detail = _("Event is closed")
 
 
+class RegistrationDeadlinePassedError(BaseServiceException):
+    default_detail = _("Registration deadline has passed")
+
+
 class DuplicateRegistrationError(BaseServiceException):
     default_detail = _("Registration already exists")
+
+
+class EventFullError(BaseServiceException):
+    default_detail = _("Event is full")
+
+
+class InvalidQueueTokenError(BaseServiceException):
+    default_detail = _("Invalid or expired queue token")
+
+
+class WaitingRoomFullError(BaseServiceException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Waiting room is full, try again later")
+
+    def __init__(self, wait: int, detail=None, code=None):
+        super().__init__(detail=detail, code=code)
+        # Sent as Retry-After by the DRF exception handler
+        self.wait = wait
+
+
+class TicketNotFoundError(BaseServiceException):
+    status_code = status.HTTP_404_NOT_FOUND
+    default_detail = _("Registration ticket not found or expired")
+
+
+class EventNotFoundError(BaseServiceException):
+    status_code = status.HTTP_404_NOT_FOUND
+    default_detail = _("Event not found")
+
+
+class InvalidVisitorImportError(BaseServiceException):
+    default_detail = _("CSV must have a full_name,email header and two columns")
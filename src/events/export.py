@@ -0,0 +1,57 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+
+CSV_COLUMNS = (
+    "id",
+    "name",
+    "area",
+    "status",
+    "event_datetime",
+    "registration_deadline",
+)
+
+VISITOR_CSV_COLUMNS = ("id", "full_name", "email", "registered_at")
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def _batched(lines: Iterable[str], size: int) -> Iterator[str]:
+    # One chunk per row would cost a socket write per event
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def write_ndjson(rows: Iterable[dict], batch_size: int) -> Iterator[str]:
+    lines = (json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    return _batched(lines, batch_size)
+
+
+def write_csv(
+    rows: Iterable[dict],
+    batch_size: int,
+    columns: tuple[str, ...] = CSV_COLUMNS,
+) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=columns, restval="")
+
+    def lines():
+        yield writer.writeheader()
+        for row in rows:
+            yield writer.writerow(row)
+
+    return _batched(lines(), batch_size)
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", write_ndjson),
+    "csv": ("text/csv", write_csv),
+}
@@ -4,14 +4,42 @@ import punq
 
 from ..notifications.repository import NotificationsRepository
 from ..notifications.services import NotificationsService, NotificationsServiceProtocol
-from .repository import EventAreaRepository, EventRepository, VisitorRepository
-from .services import AreaService, EventsService, OutboxService, VisitorService
+from .bloom import RegistrationBloomFilter
+from .cache import EventsCache
+from .counting import EventsCounter
+from .repository import (
+    EventAreaRepository,
+    EventRepository,
+    EventSeatRepository,
+    VisitorRepository,
+    WaitlistRepository,
+)
+from .services import (
+    AreaService,
+    EventsService,
+    OutboxService,
+    SeatService,
+    VisitorImportService,
+    VisitorService,
+    WaitlistService,
+)
+from .tickets import RegistrationTickets
 from .use_cases import (
+    AutocompleteUseCase,
+    BulkCreateEventsUseCase,
     CreateAreaUseCase,
     CreateEventUseCase,
+    ExportEventsUseCase,
+    ExportVisitorsUseCase,
     GetEventsUseCase,
+    GroupSignUpForEventUseCase,
+    ListVisitorsUseCase,
+    LookupRegistrationsUseCase,
+    QueueStatusUseCase,
+    RegistrationTicketUseCase,
     SignUpForEventUseCase,
 )
+from .waiting_room import WaitingRoom
 
 
 def _initialize_container() -> punq.Container:
@@ -20,18 +48,37 @@ def _initialize_container() -> punq.Container:
     container.register(EventRepository, EventRepository)
     container.register(EventAreaRepository, EventAreaRepository)
     container.register(VisitorRepository, VisitorRepository)
+    container.register(EventSeatRepository, EventSeatRepository)
+    container.register(WaitlistRepository, WaitlistRepository)
     container.register(NotificationsRepository, NotificationsRepository)
+    container.register(EventsCache, EventsCache)
+    container.register(EventsCounter, EventsCounter)
+    container.register(WaitingRoom, WaitingRoom)
+    container.register(RegistrationBloomFilter, RegistrationBloomFilter)
+    container.register(RegistrationTickets, RegistrationTickets)
 
     container.register(EventsService, EventsService)
     container.register(AreaService, AreaService)
+    container.register(SeatService, SeatService)
     container.register(NotificationsServiceProtocol, NotificationsService)
     container.register(OutboxService, OutboxService)
     container.register(VisitorService)
+    container.register(VisitorImportService)
+    container.register(WaitlistService)
 
     container.register(GetEventsUseCase, GetEventsUseCase)
     container.register(CreateAreaUseCase, CreateAreaUseCase)
     container.register(CreateEventUseCase, CreateEventUseCase)
+    container.register(BulkCreateEventsUseCase, BulkCreateEventsUseCase)
     container.register(SignUpForEventUseCase, SignUpForEventUseCase)
+    container.register(GroupSignUpForEventUseCase, GroupSignUpForEventUseCase)
+    container.register(QueueStatusUseCase, QueueStatusUseCase)
+    container.register(RegistrationTicketUseCase, RegistrationTicketUseCase)
+    container.register(AutocompleteUseCase, AutocompleteUseCase)
+    container.register(ExportEventsUseCase, ExportEventsUseCase)
+    container.register(ListVisitorsUseCase, ListVisitorsUseCase)
+    container.register(ExportVisitorsUseCase, ExportVisitorsUseCase)
+    container.register(LookupRegistrationsUseCase, LookupRegistrationsUseCase)
 
     return container
 
@@ -0,0 +1,544 @@
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.fields.tuple_lookups import Tuple, TupleLessThan
+from django.utils import timezone
+
+from src.common.response_factory import api_response_factory
+from src.common.serializer import APIResponseSerializer
+from src.core.settings import EVENTS_SEAT_SHARDS
+from src.events.dto import EventDTO, EventFilterDTO, VisitorDTO
+from src.events.ioc_container import get_container
+from src.events.models import (
+    EventAreaModel,
+    EventModel,
+    EventSeatShardModel,
+    VisitorModel,
+    WaitlistEntryModel,
+)
+from src.events.repository import (
+    EventRepository,
+    EventSeatRepository,
+    VisitorRepository,
+)
+from src.events.serializers import EventResponseEncoder, EventResponseSerializer
+from src.events.services import (
+    OutboxService,
+    WaitlistService,
+    make_signing_notification,
+)
+from src.notifications.models import NotificationModel
+from src.notifications.services import NotificationsServiceProtocol
+
+
+class Command(BaseCommand):
+    help = "Benchmark hot paths of the events API"
+
+    suites = (
+        "encoding",
+        "envelope",
+        "projection",
+        "plans",
+        "seats",
+        "registrations",
+        "waitlist",
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("suite", choices=self.suites)
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[100, 1000],
+            help="Result set sizes to benchmark.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=32,
+            help="Concurrent sign-up threads for the seats suite.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed runs per measurement (median is reported).",
+        )
+
+    def handle(self, *args, **options):
+        bench = getattr(self, f"_bench_{options['suite']}")
+        for rows in options["rows"]:
+            if options["suite"] == "seats":
+                bench(rows=rows, workers=options["workers"])
+            else:
+                bench(rows=rows, repeat=options["repeat"])
+
+    def _bench_encoding(self, rows: int, repeat: int) -> None:
+        dtos = self._make_dtos(rows)
+
+        baseline = self._measure(
+            lambda: EventResponseSerializer.from_dtos(dtos=dtos).data,
+            repeat=repeat,
+        )
+        encoder = self._measure(
+            lambda: EventResponseEncoder.from_dtos(dtos=dtos).data,
+            repeat=repeat,
+        )
+
+        self._report(
+            f"encoding, {rows} rows",
+            ("EventResponseSerializer.from_dtos", baseline),
+            ("EventResponseEncoder.from_dtos", encoder),
+        )
+
+    def _bench_envelope(self, rows: int, repeat: int) -> None:
+        data = EventResponseEncoder.from_dtos(dtos=self._make_dtos(rows)).data
+        pagination = {"offset": 0, "limit": rows, "total": rows}
+
+        def validated_envelope():
+            serializer = APIResponseSerializer(
+                data={"data": data, "meta": {}, "errors": [], "pagination": pagination},
+            )
+            serializer.is_valid(raise_exception=True)
+            return serializer.validated_data
+
+        baseline = self._measure(validated_envelope, repeat=repeat)
+        factory = self._measure(
+            lambda: api_response_factory(data=data, pagination=pagination),
+            repeat=repeat,
+        )
+
+        self._report(
+            f"envelope, {rows} rows",
+            ("APIResponseSerializer validation", baseline),
+            ("api_response_factory", factory),
+        )
+
+    def _bench_projection(self, rows: int, repeat: int) -> None:
+        with transaction.atomic():
+            self._seed_events(rows)
+            repository = EventRepository()
+
+            def model_instances():
+                queryset = (
+                    EventModel.objects.filter(status="open")
+                    .select_related("area")
+                    .order_by("-event_datetime")[:rows]
+                )
+                return [
+                    EventDTO(
+                        id=obj.id,
+                        name=obj.name,
+                        status=obj.status,
+                        area_id=obj.area_id,
+                        area=obj.area.name if obj.area else "",
+                        event_datetime=obj.event_datetime,
+                        registration_deadline=obj.registration_deadline,
+                    )
+                    for obj in queryset
+                ]
+
+            def projection():
+                return repository.get_list(queryset=repository.get_queryset()[:rows])
+
+            title = f"projection, {rows} rows"
+            self._report(
+                title,
+                ("model instances", self._measure(model_instances, repeat=repeat)),
+                ("values_list projection", self._measure(projection, repeat=repeat)),
+            )
+            self._report_memory(
+                title,
+                ("model instances", self._measure_memory(model_instances)),
+                ("values_list projection", self._measure_memory(projection)),
+            )
+            transaction.set_rollback(True)
+
+    def _bench_plans(self, rows: int, repeat: int) -> None:
+        with transaction.atomic():
+            # Open upcoming events next to a larger closed history, the shape
+            # the partial indexes are meant for
+            areas = self._seed_events(rows)
+            self._seed_events(rows * 4, status="closed", days=-3650)
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {EventModel._meta.db_table}")
+
+            repository = EventRepository()
+            newest = repository.get_queryset()
+            pivot = newest[rows // 2]
+            week = EventFilterDTO(
+                starts_from=pivot.event_datetime,
+                starts_before=pivot.event_datetime + timedelta(days=7),
+            )
+            area = EventFilterDTO(area_id=areas[0].id)
+            area_week = EventFilterDTO(
+                area_id=areas[0].id,
+                starts_from=week.starts_from,
+                starts_before=week.starts_before,
+            )
+            by_datetime = "idx_event_open_datetime"
+            by_area = "idx_event_open_area_datetime"
+            cases = {
+                "newest first": (newest[:10], by_datetime),
+                "oldest first": (
+                    repository.get_queryset(order_by="asc")[:10],
+                    by_datetime,
+                ),
+                "upcoming": (
+                    repository.get_queryset(upcoming_from=timezone.now())[:10],
+                    by_datetime,
+                ),
+                "cursor page": (
+                    newest.filter(
+                        TupleLessThan(
+                            Tuple(F("event_datetime"), F("id")),
+                            (pivot.event_datetime, pivot.id),
+                        ),
+                    )[:11],
+                    by_datetime,
+                ),
+                "date range": (
+                    repository.get_queryset(filters=week)[:10],
+                    by_datetime,
+                ),
+                "area": (repository.get_queryset(filters=area)[:10], by_area),
+                "area, date range": (
+                    repository.get_queryset(filters=area_week, order_by="asc")[:10],
+                    by_area,
+                ),
+            }
+
+            failed = []
+            self.stdout.write(f"plans, {rows} seeded rows")
+            for name, (queryset, index_name) in cases.items():
+                nodes = list(self._plan_nodes(self._explain(queryset)))
+                sorted_ = any(
+                    node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes
+                )
+                indexed = any(node.get("Index Name") == index_name for node in nodes)
+                summary = " > ".join(
+                    node["Node Type"]
+                    + (f" ({node['Index Name']})" if "Index Name" in node else "")
+                    for node in nodes
+                )
+                if sorted_ or not indexed:
+                    failed.append(f"{name} (expected {index_name})")
+                    self.stdout.write(self.style.ERROR(f"  {name}: {summary}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"  {name}: {summary}"))
+            transaction.set_rollback(True)
+
+        if failed:
+            raise CommandError(f"Not served by an index scan: {', '.join(failed)}")
+
+    def _bench_seats(self, rows: int, workers: int) -> None:
+        # Sign-ups run through OutboxService in committed transactions, twice
+        # as many as there are seats, to load the counters for real
+        outbox = get_container().resolve(OutboxService)
+        attempts = rows * 2
+        timings, failed = [], []
+        for shards in (1, EVENTS_SEAT_SHARDS):
+            event = EventModel.objects.create(
+                name=f"Benchmark seats {uuid.uuid4()}",
+                status=EventModel.EventStatus.OPEN,
+                capacity=rows,
+                event_datetime=timezone.now() + timedelta(days=30),
+                registration_deadline=timezone.now() + timedelta(days=29),
+            )
+            try:
+                EventSeatRepository().rebalance(event_id=event.id, shards=shards)
+
+                def sign_up(worker, event_id=event.id):
+                    accepted = 0
+                    try:
+                        for index in range(worker, attempts, workers):
+                            # Sign-ups past the capacity join the waitlist
+                            waitlist = outbox.register_visitor(
+                                VisitorDTO(
+                                    event_id=event_id,
+                                    full_name=f"Benchmark visitor {index}",
+                                    email=f"visitor-{index}@benchmark.invalid",
+                                ),
+                            )
+                            accepted += waitlist is None
+                    finally:
+                        connections.close_all()
+                    return accepted
+
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    accepted = sum(executor.map(sign_up, range(workers)))
+                timings.append((f"{shards} shard(s)", time.perf_counter() - started))
+
+                visitors = VisitorModel.objects.filter(event_id=event.id).count()
+                taken = EventSeatShardModel.objects.filter(
+                    event_id=event.id,
+                ).aggregate(total=Sum("taken"))["total"]
+                waitlisted = WaitlistEntryModel.objects.filter(event=event).count()
+                if not (
+                    accepted == visitors == taken == rows
+                    and waitlisted == attempts - rows
+                ):
+                    failed.append(
+                        f"{shards} shard(s): capacity {rows}, accepted {accepted}, "
+                        f"visitors {visitors}, seats taken {taken}, "
+                        f"waitlisted {waitlisted}",
+                    )
+            finally:
+                NotificationModel.objects.filter(
+                    payload__email__endswith="@benchmark.invalid",
+                ).delete()
+                event.delete()
+
+        self._report(
+            f"seats, capacity {rows}, {attempts} sign-ups, {workers} workers",
+            *timings,
+        )
+        if failed:
+            raise CommandError(f"Seat counters out of sync: {'; '.join(failed)}")
+
+    def _bench_registrations(self, rows: int, repeat: int) -> None:
+        per_email = 5
+        with transaction.atomic():
+            self._seed_events(max(rows // 1000, per_email))
+            event_ids = list(
+                EventModel.objects.filter(
+                    name__startswith="Benchmark event",
+                ).values_list("id", flat=True),
+            )
+            # Every email registers for per_email distinct events, seeded in
+            # SQL as the Python side would dominate at millions of rows
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO visitors
+                        (id, event_id, full_name, email, registered_at, updated_at)
+                    SELECT
+                        gen_random_uuid(),
+                        (%(event_ids)s::uuid[])[
+                            1 + (i / %(per_email)s + i %% %(per_email)s)
+                            %% cardinality(%(event_ids)s::uuid[])
+                        ],
+                        'Benchmark visitor',
+                        'visitor-' || i / %(per_email)s || '@benchmark.invalid',
+                        now() - i * interval '1 second',
+                        now()
+                    FROM generate_series(0, %(rows)s - 1) AS i
+                    """,
+                    {"event_ids": event_ids, "per_email": per_email, "rows": rows},
+                )
+                cursor.execute(f"ANALYZE {VisitorModel._meta.db_table}")
+
+            email = f"visitor-{rows // per_email // 2}@benchmark.invalid"
+            lookup = VisitorRepository().get_email_queryset(email=email)
+            lookup = lookup.order_by("-registered_at", "-id")[:11]
+            # What the admin runs for a search over its search_fields
+            admin_search = (
+                VisitorModel.objects.select_related("event_id")
+                .filter(
+                    Q(full_name__icontains=email)
+                    | Q(email__icontains=email)
+                    | Q(event_id__name__icontains=email),
+                )
+                .order_by("-registered_at")[:100]
+            )
+
+            nodes = list(self._plan_nodes(self._explain(lookup)))
+            indexed = any(
+                node.get("Index Name") == "idx_visitor_email" for node in nodes
+            )
+            found = len(list(lookup))
+            self._report(
+                f"registrations by email, {rows} visitors",
+                (
+                    "admin search",
+                    self._measure(lambda: list(admin_search.all()), repeat=repeat),
+                ),
+                (
+                    "email lookup",
+                    self._measure(lambda: list(lookup.all()), repeat=repeat),
+                ),
+            )
+            transaction.set_rollback(True)
+
+        if not indexed:
+            raise CommandError("Email lookup is not served by idx_visitor_email")
+        if found != per_email:
+            raise CommandError(f"Expected {per_email} registrations, found {found}")
+
+    def _bench_waitlist(self, rows: int, repeat: int) -> None:
+        with transaction.atomic():
+            event = EventModel.objects.create(
+                name=f"Benchmark waitlist {uuid.uuid4()}",
+                status=EventModel.EventStatus.OPEN,
+                capacity=rows,
+                event_datetime=timezone.now() + timedelta(days=30),
+                registration_deadline=timezone.now() + timedelta(days=29),
+            )
+            seats = EventSeatRepository()
+            seats.rebalance(event_id=event.id, shards=EVENTS_SEAT_SHARDS)
+            # Twice as many waiting as there are seats, as after a sold-out
+            # event's capacity is raised
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO event_waitlist (event_id, full_name, email, created_at)
+                    SELECT
+                        %(event_id)s,
+                        'Benchmark visitor',
+                        'visitor-' || i || '@benchmark.invalid',
+                        now()
+                    FROM generate_series(1, %(rows)s * 2) AS i
+                    """,
+                    {"event_id": event.id, "rows": rows},
+                )
+            container = get_container()
+            notifications = container.resolve(NotificationsServiceProtocol)
+            waitlist = container.resolve(WaitlistService)
+            promoted = []
+
+            def per_row():
+                # One visitor, seat, notification and delete per entry
+                with transaction.atomic():
+                    entries = WaitlistEntryModel.objects.filter(event=event)[:rows]
+                    for entry in entries:
+                        visitor = VisitorModel.objects.create(
+                            event_id=event,
+                            full_name=entry.full_name,
+                            email=entry.email,
+                        )
+                        seats.claim(event_id=event.id)
+                        notifications.create_notification(
+                            dto=make_signing_notification(
+                                VisitorDTO(
+                                    id=visitor.id,
+                                    full_name=visitor.full_name,
+                                    email=visitor.email,
+                                    event_id=event.id,
+                                ),
+                            ),
+                        )
+                        entry.delete()
+                    transaction.set_rollback(True)
+
+            def set_based():
+                with transaction.atomic():
+                    promoted.append(
+                        waitlist.promote_event(event_id=event.id, batch_size=rows),
+                    )
+                    transaction.set_rollback(True)
+
+            self._report(
+                f"waitlist promotion, {rows} seats",
+                ("per-row loop", self._measure(per_row, repeat=repeat)),
+                ("set-based promote", self._measure(set_based, repeat=repeat)),
+            )
+            transaction.set_rollback(True)
+
+        if set(promoted) != {rows}:
+            raise CommandError(f"Expected {rows} promoted, got {sorted(set(promoted))}")
+
+    @staticmethod
+    def _explain(queryset) -> dict:
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            return cursor.fetchone()[0][0]["Plan"]
+
+    @classmethod
+    def _plan_nodes(cls, plan: dict):
+        yield plan
+        for child in plan.get("Plans", ()):
+            yield from cls._plan_nodes(child)
+
+    @staticmethod
+    def _seed_events(
+        rows: int,
+        status: str = "open",
+        days: int = 3650,
+    ) -> list[EventAreaModel]:
+        areas = EventAreaModel.objects.bulk_create(
+            EventAreaModel(name=f"Benchmark Hall {uuid.uuid4()}") for _ in range(20)
+        )
+        now = timezone.now()
+        EventModel.objects.bulk_create(
+            (
+                EventModel(
+                    name=f"Benchmark event {index}",
+                    status=status,
+                    area=areas[index % len(areas)] if index % 3 else None,
+                    event_datetime=now + timedelta(days=days, minutes=index),
+                    registration_deadline=now + timedelta(days=days - 1),
+                )
+                for index in range(rows)
+            ),
+            batch_size=5000,
+        )
+        return areas
+
+    @staticmethod
+    def _make_dtos(rows: int) -> list[EventDTO]:
+        now = timezone.now()
+        return [
+            EventDTO(
+                id=uuid.uuid4(),
+                name=f"Benchmark event {index}",
+                status="open",
+                area="Main Hall" if index % 3 else "",
+                event_datetime=now + timedelta(hours=index),
+                registration_deadline=now + timedelta(hours=index - 1),
+            )
+            for index in range(rows)
+        ]
+
+    @staticmethod
+    def _measure(func, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return median(timings)
+
+    @staticmethod
+    def _measure_memory(func) -> int:
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def _report_memory(self, title: str, baseline: tuple, candidate: tuple) -> None:
+        (baseline_name, baseline_peak), (candidate_name, candidate_peak) = (
+            baseline,
+            candidate,
+        )
+        saved = 1 - candidate_peak / baseline_peak if baseline_peak else 0.0
+        self.stdout.write(
+            f"{title}, peak memory\n"
+            f"  {baseline_name}: {baseline_peak / 1024:.1f} KiB\n"
+            f"  {candidate_name}: {candidate_peak / 1024:.1f} KiB\n"
+            + self.style.SUCCESS(f"  saved: {saved:.0%}"),
+        )
+
+    def _report(self, title: str, baseline: tuple, candidate: tuple) -> None:
+        (baseline_name, baseline_time), (candidate_name, candidate_time) = (
+            baseline,
+            candidate,
+        )
+        speedup = baseline_time / candidate_time if candidate_time else float("inf")
+        self.stdout.write(
+            f"{title}\n"
+            f"  {baseline_name}: {baseline_time * 1000:.3f} ms\n"
+            f"  {candidate_name}: {candidate_time * 1000:.3f} ms\n"
+            + self.style.SUCCESS(f"  speedup: {speedup:.1f}x"),
+        )
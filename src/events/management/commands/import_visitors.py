@@ -0,0 +1,44 @@
+import sys
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.common.exceptions import BaseServiceException
+from src.events.ioc_container import get_container
+from src.events.services import VisitorImportService
+
+
+class Command(BaseCommand):
+    help = (
+        "Import an event's visitors from a CSV with a 'full_name,email' header "
+        "through COPY, skipping invalid rows and already registered emails"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("event_id", type=UUID)
+        parser.add_argument("path", help="CSV file to import, or - for stdin.")
+
+    def handle(self, *args, **options):
+        service = get_container().resolve(VisitorImportService)
+        try:
+            if options["path"] == "-":
+                result = service.import_csv(
+                    event_id=options["event_id"],
+                    stream=sys.stdin.buffer,
+                )
+            else:
+                with open(options["path"], "rb") as stream:
+                    result = service.import_csv(
+                        event_id=options["event_id"],
+                        stream=stream,
+                    )
+        except (BaseServiceException, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            f"rows: {result.rows}\n"
+            f"invalid: {result.invalid}\n"
+            f"already registered or repeated: {result.duplicates}\n"
+            f"over capacity: {result.over_capacity}\n"
+            + self.style.SUCCESS(f"imported: {result.imported}"),
+        )
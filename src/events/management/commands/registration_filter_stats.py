@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from src.events.bloom import RegistrationBloomFilter
+
+
+class Command(BaseCommand):
+    help = "Show hit statistics of the per-event registration Bloom filters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "event_ids",
+            nargs="*",
+            help="Events whose filter fill ratio and estimated error rate to show.",
+        )
+
+    def handle(self, *args, **options):
+        bloom = RegistrationBloomFilter()
+        stats = bloom.get_stats()
+        self.stdout.write(
+            f"filter size: {bloom.size} bits, {bloom.hashes} hashes\n"
+            f"new emails passed without a query: {stats.negatives}\n"
+            f"duplicates rejected after a hit: {stats.duplicates}\n"
+            f"false positives (hit, not registered): {stats.false_positives}\n"
+            + self.style.SUCCESS(
+                f"observed false-positive rate: {stats.false_positive_rate:.4%}",
+            ),
+        )
+
+        for event_id in options["event_ids"]:
+            fill_ratio = bloom.get_fill_ratio(event_id)
+            if fill_ratio is None:
+                self.stdout.write(f"{event_id}: no filter, rebuilt on next sign-up")
+                continue
+            self.stdout.write(
+                f"{event_id}: {fill_ratio:.2%} of bits set, estimated "
+                f"false-positive rate {bloom.estimate_error_rate(fill_ratio):.4%}",
+            )
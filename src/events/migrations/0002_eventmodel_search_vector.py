@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, transaction
+
+BACKFILL_BATCH_SIZE = 5000
+
+CREATE_TRIGGER_SQL = """
+CREATE TRIGGER events_search_vector_update
+BEFORE INSERT OR UPDATE ON events
+FOR EACH ROW EXECUTE FUNCTION
+tsvector_update_trigger(search_vector, 'pg_catalog.english', name);
+"""
+
+DROP_TRIGGER_SQL = "DROP TRIGGER IF EXISTS events_search_vector_update ON events;"
+
+
+def backfill_search_vector(apps, schema_editor):
+    EventModel = apps.get_model("events", "EventModel")
+    using = schema_editor.connection.alias
+    pending = (
+        EventModel.objects.using(using)
+        .filter(search_vector__isnull=True)
+        .order_by()
+        .values_list("pk", flat=True)
+    )
+
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(pending[:BACKFILL_BATCH_SIZE])
+            if not batch:
+                break
+            EventModel.objects.using(using).filter(pk__in=batch).update(
+                search_vector=SearchVector("name", config="english"),
+            )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmodel",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="Full-text search vector of the name, maintained by a trigger",
+                null=True,
+                verbose_name="search_vector",
+            ),
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+        migrations.RunPython(
+            backfill_search_vector,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        AddIndexConcurrently(
+            model_name="eventmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"],
+                name="idx_event_search_vector",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:04
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0002_eventmodel_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="eventareamodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="idx_area_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="eventmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="idx_event_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:11
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0003_trigram_name_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("status", "open")),
+                fields=["event_datetime", "id"],
+                name="idx_event_open_datetime",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="eventmodel",
+            name="idx_status_datetime",
+        ),
+    ]
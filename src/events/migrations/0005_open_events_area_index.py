@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:20
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0004_open_events_partial_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("status", "open")),
+                fields=["area", "event_datetime", "id"],
+                name="idx_event_open_area_datetime",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="eventmodel",
+            name="idx_area_datetime",
+        ),
+    ]
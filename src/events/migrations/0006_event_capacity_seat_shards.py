@@ -0,0 +1,78 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:18
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_open_events_area_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmodel",
+            name="capacity",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Maximum number of visitors, leave empty for no limit",
+                null=True,
+                verbose_name="capacity",
+            ),
+        ),
+        migrations.CreateModel(
+            name="EventSeatShardModel",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="id",
+                    ),
+                ),
+                ("shard", models.PositiveSmallIntegerField(verbose_name="shard")),
+                (
+                    "capacity",
+                    models.PositiveIntegerField(
+                        help_text="Seats held by this shard", verbose_name="capacity"
+                    ),
+                ),
+                (
+                    "taken",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Seats of this shard already claimed",
+                        verbose_name="taken",
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seat_shards",
+                        to="events.eventmodel",
+                        verbose_name="event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "event seat shard",
+                "verbose_name_plural": "event seat shards",
+                "db_table": "event_seat_shards",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("event", "shard"), name="unique_seat_shard_per_event"
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("taken__lte", models.F("capacity"))),
+                        name="seat_shard_taken_lte_capacity",
+                    ),
+                ],
+            },
+        ),
+    ]
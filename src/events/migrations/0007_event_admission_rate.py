@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_event_capacity_seat_shards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmodel",
+            name="admission_rate",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Sign-ups admitted per second through the waiting room, leave empty to disable it",
+                null=True,
+                verbose_name="admission_rate",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:40
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0007_event_admission_rate"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="visitormodel",
+            index=models.Index(
+                fields=["event_id", "-registered_at", "-id"],
+                name="idx_visitor_event_keyset",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="visitormodel",
+            name="idx_visitor_event",
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:50
+
+from django.db import migrations, transaction
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Walks the primary key so each batch is an index range, not a rescan of the
+# table. A mixed-case email whose lowercase spelling is already registered
+# for the same event, or taken by an earlier row, is left as is rather than
+# break the unique constraint.
+LOWERCASE_EMAILS_SQL = """
+WITH batch AS (
+    SELECT id FROM visitors WHERE id > %(after)s ORDER BY id LIMIT %(limit)s
+),
+candidate AS (
+    SELECT DISTINCT ON (event_id, lower(email)) id
+    FROM visitors
+    WHERE id IN (SELECT id FROM batch) AND email <> lower(email)
+    ORDER BY event_id, lower(email), id
+),
+updated AS (
+    UPDATE visitors SET email = lower(email)
+    WHERE id IN (SELECT id FROM candidate)
+        AND NOT EXISTS (
+            SELECT 1 FROM visitors AS other
+            WHERE other.event_id = visitors.event_id
+                AND other.email = lower(visitors.email)
+        )
+)
+SELECT id FROM batch ORDER BY id DESC LIMIT 1
+"""
+
+
+def lowercase_emails(apps, schema_editor):
+    connection = schema_editor.connection
+    after = "00000000-0000-0000-0000-000000000000"
+    while after is not None:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                LOWERCASE_EMAILS_SQL,
+                {"after": after, "limit": BACKFILL_BATCH_SIZE},
+            )
+            last = cursor.fetchone()
+        after = last[0] if last else None
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0008_visitor_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            lowercase_emails,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("events", "0009_lowercase_visitor_emails"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("status", "open")),
+                fields=["registration_deadline"],
+                name="idx_event_open_deadline",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0010_event_open_deadline_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WaitlistEntryModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        primary_key=True, serialize=False, verbose_name="id"
+                    ),
+                ),
+                (
+                    "full_name",
+                    models.CharField(
+                        help_text="The visitor's full name",
+                        max_length=255,
+                        verbose_name="full_name",
+                    ),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        help_text="Contact email address for the visitor",
+                        max_length=255,
+                        verbose_name="email",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created_at"),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist",
+                        to="events.eventmodel",
+                        verbose_name="event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "waitlist entry",
+                "verbose_name_plural": "waitlist entries",
+                "db_table": "event_waitlist",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(fields=["event", "id"], name="idx_waitlist_event_fifo")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("event", "email"),
+                        name="unique_waitlist_entry_per_event",
+                    )
+                ],
+            },
+        ),
+    ]
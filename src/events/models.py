@@ -1,8 +1,14 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+# Text search configuration used by the events_search_vector_update trigger
+# and by every query against EventModel.search_vector.
+SEARCH_CONFIG = "english"
+
 
 # TODO: write validators for admin panel
 class EventAreaModel(models.Model):
@@ -38,6 +44,11 @@ class EventAreaModel(models.Model):
         indexes = [
             models.Index(fields=["name"], name="idx_name"),
             models.Index(fields=["-created_at"], name="idx_area_created_at"),
+            GinIndex(
+                fields=["name"],
+                name="idx_area_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self) -> str:
@@ -85,6 +96,21 @@ class EventModel(models.Model):
         null=False,
         blank=False,
     )
+    capacity = models.PositiveIntegerField(
+        verbose_name=_("capacity"),
+        help_text=_("Maximum number of visitors, leave empty for no limit"),
+        null=True,
+        blank=True,
+    )
+    admission_rate = models.PositiveIntegerField(
+        verbose_name=_("admission_rate"),
+        help_text=_(
+            "Sign-ups admitted per second through the waiting room, "
+            "leave empty to disable it"
+        ),
+        null=True,
+        blank=True,
+    )
     event_datetime = models.DateTimeField(
         verbose_name=_("event_datetime"),
         help_text=_("Date and time when the event takes place"),
@@ -92,6 +118,12 @@ class EventModel(models.Model):
         null=False,
         blank=False,
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=_("search_vector"),
+        help_text=_("Full-text search vector of the name, maintained by a trigger"),
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_("created_at"),
@@ -109,17 +141,76 @@ class EventModel(models.Model):
         ordering = ["-event_datetime", "name"]
         indexes = [
             models.Index(
-                fields=["status", "-event_datetime"],
-                name="idx_status_datetime",
+                fields=["event_datetime", "id"],
+                name="idx_event_open_datetime",
+                condition=models.Q(status="open"),
+            ),
+            models.Index(
+                fields=["area", "event_datetime", "id"],
+                name="idx_event_open_area_datetime",
+                condition=models.Q(status="open"),
+            ),
+            models.Index(
+                fields=["registration_deadline"],
+                name="idx_event_open_deadline",
+                condition=models.Q(status="open"),
             ),
-            models.Index(fields=["area", "-event_datetime"], name="idx_area_datetime"),
             models.Index(fields=["-created_at"], name="idx_event_created_at"),
+            GinIndex(fields=["search_vector"], name="idx_event_search_vector"),
+            GinIndex(
+                fields=["name"],
+                name="idx_event_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self) -> str:
         return f"{self.name} {self.event_datetime}"
 
 
+class EventSeatShardModel(models.Model):
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name=_("id"),
+    )
+    event = models.ForeignKey(
+        EventModel,
+        related_name="seat_shards",
+        on_delete=models.CASCADE,
+        verbose_name=_("event"),
+    )
+    shard = models.PositiveSmallIntegerField(verbose_name=_("shard"))
+    capacity = models.PositiveIntegerField(
+        verbose_name=_("capacity"),
+        help_text=_("Seats held by this shard"),
+    )
+    taken = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("taken"),
+        help_text=_("Seats of this shard already claimed"),
+    )
+
+    class Meta:
+        verbose_name = _("event seat shard")
+        verbose_name_plural = _("event seat shards")
+        db_table = "event_seat_shards"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "shard"],
+                name="unique_seat_shard_per_event",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(taken__lte=models.F("capacity")),
+                name="seat_shard_taken_lte_capacity",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_id} #{self.shard} ({self.taken}/{self.capacity})"
+
+
 class VisitorModel(models.Model):
     id = models.UUIDField(
         primary_key=True,
@@ -168,11 +259,64 @@ class VisitorModel(models.Model):
         ]
         indexes = [
             models.Index(
-                fields=["event_id", "-registered_at"],
-                name="idx_visitor_event",
+                fields=["event_id", "-registered_at", "-id"],
+                name="idx_visitor_event_keyset",
             ),
             models.Index(fields=["email"], name="idx_visitor_email"),
         ]
 
+    def clean(self) -> None:
+        super().clean()
+        self.email = self.email.lower()
+
+    def __str__(self) -> str:
+        return f"{self.full_name} ({self.email})"
+
+
+class WaitlistEntryModel(models.Model):
+    # A sequence rather than a UUID, so ids give the FIFO order, also within
+    # a group added by one statement
+    id = models.BigAutoField(primary_key=True, verbose_name=_("id"))
+    event = models.ForeignKey(
+        EventModel,
+        related_name="waitlist",
+        on_delete=models.CASCADE,
+        verbose_name=_("event"),
+        db_index=False,
+    )
+    full_name = models.CharField(
+        max_length=255,
+        verbose_name=_("full_name"),
+        help_text=_("The visitor's full name"),
+    )
+    email = models.EmailField(
+        max_length=255,
+        verbose_name=_("email"),
+        help_text=_("Contact email address for the visitor"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("created_at"),
+    )
+
+    class Meta:
+        verbose_name = _("waitlist entry")
+        verbose_name_plural = _("waitlist entries")
+        db_table = "event_waitlist"
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "email"],
+                name="unique_waitlist_entry_per_event",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["event", "id"], name="idx_waitlist_event_fifo"),
+        ]
+
+    def clean(self) -> None:
+        super().clean()
+        self.email = self.email.lower()
+
     def __str__(self) -> str:
         return f"{self.full_name} ({self.email})"
@@ -0,0 +1,63 @@
+from django.db.models import QuerySet
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+
+from ..common.pagination import KeysetPagination
+from .counting import EventsCounter
+
+
+class EventCountMixin:
+    def __init__(self, counter: EventsCounter, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counter = counter
+        self.total_count = None
+
+    def get_count(self, queryset: QuerySet) -> int:
+        self.total_count = self.counter.count(queryset)
+        return self.total_count.value
+
+    def get_total_data(self) -> dict:
+        if self.total_count is None:
+            return {}
+        return {
+            "total": self.total_count.value,
+            "total_strategy": self.total_count.strategy,
+            "total_cached": self.total_count.cached,
+        }
+
+
+class EventLimitOffsetPagination(EventCountMixin, LimitOffsetPagination):
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        self.request = request
+        # An estimated total may be below the real one, so pages past it are
+        # still fetched instead of being cut off
+        return list(queryset[self.offset : self.offset + self.limit])
+
+
+class EventKeysetPagination(EventCountMixin, KeysetPagination):
+    position_field = "event_datetime"
+    upcoming_query_param = "upcoming"
+
+    @classmethod
+    def is_upcoming(cls, request: Request) -> bool:
+        value = request.query_params.get(cls.upcoming_query_param, "")
+        return value.lower() in ("1", "true", "yes")
+
+    def is_descending(self, request: Request) -> bool:
+        default = "asc" if self.is_upcoming(request) else "desc"
+        order_by = request.query_params.get("order_by") or default
+        return order_by.lower() != "asc"
+
+    def get_pagination_data(self) -> dict:
+        return {**super().get_pagination_data(), **self.get_total_data()}
+
+
+class VisitorKeysetPagination(KeysetPagination):
+    # Newest registrations first, the order of idx_visitor_event_keyset
+    position_field = "registered_at"
@@ -1,14 +1,363 @@
+import json
+import re
+import uuid
+from collections.abc import Iterator
+from datetime import datetime
+from typing import IO
 from uuid import UUID
 
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
 from django.core.exceptions import ValidationError
+from django.db import DataError, connection, transaction
+from django.db.models import Count, Exists, F, Max, OuterRef, Q, QuerySet
+from django.db.models.functions import Now
 
-from .dto import EventAreaDTO, EventDTO, VisitorDTO
-from .models import EventAreaModel, EventModel, VisitorModel
+from ..notifications.dto import NotificationDTO
+from .dto import (
+    EventAreaDTO,
+    EventDTO,
+    EventFilterDTO,
+    EventsStateDTO,
+    GroupRegistrationResultDTO,
+    RegisteredVisitorDTO,
+    RegistrationResultDTO,
+    SuggestionDTO,
+    VisitorDTO,
+    VisitorImportResultDTO,
+    VisitorRegistrationDTO,
+)
+from .exceptions import EventNotFoundError, InvalidVisitorImportError
+from .models import (
+    SEARCH_CONFIG,
+    EventAreaModel,
+    EventModel,
+    EventSeatShardModel,
+    VisitorModel,
+    WaitlistEntryModel,
+)
+
+# Checks the event and its deadline, inserts the visitor and its outbox
+# notification in one round trip. The notification is only written when the
+# visitor row was. While anyone is waitlisted for a limited event, a freed seat
+# is theirs: nothing is inserted and the sign-up queues behind them.
+REGISTER_VISITOR_SQL = """
+WITH event AS (
+    SELECT
+        id,
+        capacity,
+        registration_deadline > now() AS accepting,
+        capacity IS NOT NULL AND EXISTS (
+            SELECT 1 FROM event_waitlist WHERE event_waitlist.event_id = events.id
+        ) AS queued
+    FROM events WHERE id = %(event_id)s AND status = 'open'
+),
+visitor AS (
+    INSERT INTO visitors (id, event_id, full_name, email, registered_at, updated_at)
+    SELECT %(visitor_id)s, event.id, %(full_name)s, %(email)s, now(), now()
+    FROM event
+    WHERE event.accepting AND NOT event.queued
+    ON CONFLICT (event_id, email) DO NOTHING
+    RETURNING id
+),
+notification AS (
+    INSERT INTO notifications (id, topic, payload, created_at, sent)
+    SELECT %(notification_id)s, %(topic)s, %(payload)s::jsonb, now(), false
+    FROM visitor
+)
+SELECT
+    EXISTS (SELECT 1 FROM event),
+    EXISTS (SELECT 1 FROM visitor),
+    EXISTS (SELECT 1 FROM event WHERE capacity IS NOT NULL),
+    EXISTS (SELECT 1 FROM event WHERE NOT accepting),
+    EXISTS (SELECT 1 FROM event WHERE queued)
+"""
+
+# Group variant of REGISTER_VISITOR_SQL: one multi-row insert for the whole
+# group. Notifications are bulk-created once the seats are claimed.
+REGISTER_GROUP_SQL = """
+WITH event AS (
+    SELECT
+        id,
+        capacity,
+        registration_deadline > now() AS accepting,
+        capacity IS NOT NULL AND EXISTS (
+            SELECT 1 FROM event_waitlist WHERE event_waitlist.event_id = events.id
+        ) AS queued
+    FROM events WHERE id = %(event_id)s AND status = 'open'
+),
+visitor AS (
+    INSERT INTO visitors (id, event_id, full_name, email, registered_at, updated_at)
+    SELECT member.id, event.id, member.full_name, member.email, now(), now()
+    FROM event, unnest(
+        %(ids)s::uuid[],
+        %(full_names)s::text[],
+        %(emails)s::text[]
+    ) WITH ORDINALITY AS member(id, full_name, email, position)
+    WHERE event.accepting AND NOT event.queued
+    ORDER BY member.position
+    ON CONFLICT (event_id, email) DO NOTHING
+    RETURNING id
+)
+SELECT
+    EXISTS (SELECT 1 FROM event),
+    EXISTS (SELECT 1 FROM event WHERE capacity IS NOT NULL),
+    EXISTS (SELECT 1 FROM event WHERE NOT accepting),
+    EXISTS (SELECT 1 FROM event WHERE queued),
+    ARRAY (SELECT id::text FROM visitor)
+"""
+
+# Claims up to %(count)s seats in one statement, filling the shards with free
+# seats in shard order. They are locked in that order too, like the blocking
+# single-seat claim, so the two cannot deadlock.
+CLAIM_SEATS_SQL = """
+WITH locked AS (
+    SELECT id, shard, capacity - taken AS free
+    FROM event_seat_shards
+    WHERE event_id = %(event_id)s AND taken < capacity
+    ORDER BY shard
+    FOR UPDATE
+),
+take AS (
+    SELECT id, least(
+        free,
+        greatest(%(count)s - (sum(free) OVER (ORDER BY shard) - free), 0)
+    ) AS seats
+    FROM locked
+)
+UPDATE event_seat_shards SET taken = taken + take.seats
+FROM take
+WHERE event_seat_shards.id = take.id AND take.seats > 0
+RETURNING take.seats
+"""
+
+# Closes one batch of open events past their registration deadline, found
+# through idx_event_open_deadline. Rows locked by a concurrent update are left
+# to the next batch; sign-ups only take a key share lock, which NO KEY UPDATE
+# does not wait for.
+CLOSE_EXPIRED_EVENTS_SQL = """
+UPDATE events SET status = 'closed', updated_at = now()
+WHERE id IN (
+    SELECT id FROM events
+    WHERE status = 'open' AND registration_deadline <= %(now)s
+    ORDER BY registration_deadline
+    LIMIT %(limit)s
+    FOR NO KEY UPDATE SKIP LOCKED
+)
+"""
+
+
+# Claims one seat from a random shard with free seats. SKIP LOCKED lets
+# concurrent sign-ups spread over the shards instead of queueing on one row.
+CLAIM_SEAT_SQL = """
+UPDATE event_seat_shards SET taken = taken + 1
+WHERE id = (
+    SELECT id FROM event_seat_shards
+    WHERE event_id = %s AND taken < capacity
+    ORDER BY random()
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id
+"""
+
+# Used when every shard with free seats is locked: waits for one instead.
+# A shard found full after the wait stays locked until commit, so shards are
+# taken in a fixed order to keep such waits from deadlocking.
+CLAIM_SEAT_BLOCKING_SQL = CLAIM_SEAT_SQL.replace(
+    "ORDER BY random()",
+    "ORDER BY shard",
+).replace(" SKIP LOCKED", "")
+
+
+CREATE_VISITOR_IMPORT_SQL = """
+CREATE TEMPORARY TABLE visitor_import (
+    line bigserial,
+    full_name text,
+    email text
+) ON COMMIT DROP
+"""
+
+COPY_VISITOR_IMPORT_SQL = """
+COPY visitor_import (full_name, email)
+FROM STDIN WITH (FORMAT csv, HEADER MATCH, ENCODING 'UTF8')
+"""
+
+# Keeps the first valid row per email, skips emails already registered for
+# the event (up to the free seats) and writes each visitor's outbox
+# notification in the same statement
+IMPORT_VISITORS_SQL = r"""
+WITH valid AS (
+    SELECT line, full_name, email
+    FROM (
+        SELECT line, btrim(full_name) AS full_name, lower(btrim(email)) AS email
+        FROM visitor_import
+    ) AS row
+    WHERE full_name <> ''
+        AND length(full_name) <= 255
+        AND length(email) <= 255
+        AND email ~ '^[^@\s]+@[^@\s]+\.[^@\s]+$'
+),
+candidate AS (
+    SELECT DISTINCT ON (email) * FROM valid ORDER BY email, line
+),
+fresh AS (
+    SELECT * FROM candidate
+    WHERE NOT EXISTS (
+        SELECT 1 FROM visitors
+        WHERE visitors.event_id = %(event_id)s AND visitors.email = candidate.email
+    )
+),
+accepted AS (
+    SELECT * FROM fresh ORDER BY line LIMIT %(limit)s
+),
+visitor AS (
+    INSERT INTO visitors (id, event_id, full_name, email, registered_at, updated_at)
+    SELECT gen_random_uuid(), %(event_id)s, full_name, email, now(), now()
+    FROM accepted
+    ORDER BY line
+    ON CONFLICT (event_id, email) DO NOTHING
+    RETURNING id, email
+),
+notification AS (
+    INSERT INTO notifications (id, topic, payload, created_at, sent)
+    SELECT
+        gen_random_uuid(),
+        %(topic)s,
+        jsonb_build_object(
+            'owner_id', visitor.id::text,
+            'email', visitor.email,
+            -- Like generate_code(), from a CSPRNG rather than random(): the
+            -- first 48 bits of a v4 UUID come from pg_strong_random()
+            'message', lpad(
+                (
+                    ('x' || left(replace(gen_random_uuid()::text, '-', ''), 12))
+                    ::bit(48)::bigint %% 10000
+                )::text,
+                4,
+                '0'
+            )
+        ),
+        now(),
+        false
+    FROM visitor
+)
+SELECT
+    (SELECT count(*) FROM visitor_import),
+    (SELECT count(*) FROM valid),
+    (SELECT count(*) FROM fresh),
+    (SELECT count(*) FROM visitor)
+"""
+
+# Adds people turned away by a full event and returns their positions. Rows are
+# inserted in request order, so their sequence ids keep the group's order on
+# the waitlist. Registered emails are not added, and an email whose entry is
+# neither in the snapshot nor inserted gets no position.
+ADD_TO_WAITLIST_SQL = """
+WITH member AS (
+    SELECT * FROM unnest(
+        %(full_names)s::text[],
+        %(emails)s::text[]
+    ) WITH ORDINALITY AS member(full_name, email, position)
+),
+added AS (
+    INSERT INTO event_waitlist (event_id, full_name, email, created_at)
+    SELECT %(event_id)s, member.full_name, member.email, now()
+    FROM member
+    WHERE NOT EXISTS (
+        SELECT 1 FROM visitors
+        WHERE visitors.event_id = %(event_id)s AND visitors.email = member.email
+    )
+    ORDER BY member.position
+    ON CONFLICT (event_id, email) DO NOTHING
+    RETURNING id, email
+),
+entry AS (
+    SELECT DISTINCT ON (member.email)
+        member.email,
+        coalesce(added.id, existing.id) AS id
+    FROM member
+    LEFT JOIN added ON added.email = member.email
+    LEFT JOIN event_waitlist AS existing
+        ON existing.event_id = %(event_id)s AND existing.email = member.email
+    ORDER BY member.email
+)
+SELECT
+    entry.email,
+    CASE WHEN entry.id IS NOT NULL THEN
+        1
+        + (
+            SELECT count(*) FROM event_waitlist
+            WHERE event_waitlist.event_id = %(event_id)s
+                AND event_waitlist.id < entry.id
+        )
+        + (SELECT count(*) FROM added WHERE added.id < entry.id)
+    END
+FROM entry
+"""
+
+WAITLIST_POSITIONS_SQL = """
+SELECT email, position
+FROM (
+    SELECT email, row_number() OVER (ORDER BY id) AS position
+    FROM event_waitlist
+    WHERE event_id = %(event_id)s
+) AS ranked
+WHERE email = ANY(%(emails)s::text[])
+"""
+
+# Moves the head of an event's waitlist into visitors in one statement. An
+# entry whose email registered meanwhile is consumed without a new visitor.
+PROMOTE_WAITLIST_SQL = """
+WITH entry AS (
+    SELECT id FROM event_waitlist
+    WHERE event_id = %(event_id)s
+    ORDER BY id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+),
+promoted AS (
+    DELETE FROM event_waitlist USING entry
+    WHERE event_waitlist.id = entry.id
+    RETURNING event_waitlist.id, event_waitlist.full_name, event_waitlist.email
+)
+INSERT INTO visitors (id, event_id, full_name, email, registered_at, updated_at)
+SELECT gen_random_uuid(), %(event_id)s, full_name, email, now(), now()
+FROM promoted
+ORDER BY promoted.id
+ON CONFLICT (event_id, email) DO NOTHING
+RETURNING id, full_name, email
+"""
+
+
+def _suggest(queryset: QuerySet, term: str, limit: int) -> list[SuggestionDTO]:
+    # Word-prefix regex and word similarity are both served by gin_trgm_ops.
+    rows = (
+        queryset.filter(
+            Q(name__iregex=rf"\m{re.escape(term)}")
+            | Q(name__trigram_word_similar=term),
+        )
+        .annotate(similarity=TrigramWordSimilarity(term, "name"))
+        .order_by("-similarity", "name")
+        .values_list("id", "name")[:limit]
+    )
+    return [SuggestionDTO(id=pk, name=name) for pk, name in rows]
 
 
 class EventRepository:
     model = EventModel
+    list_fields = (
+        "id",
+        "name",
+        "status",
+        "area_id",
+        "area__name",
+        "event_datetime",
+        "registration_deadline",
+    )
 
     def create(self, dto: EventDTO) -> EventDTO:
         try:
@@ -18,6 +367,8 @@ class EventRepository:
                 area_id=dto.area_id,
                 event_datetime=dto.event_datetime,
                 registration_deadline=dto.registration_deadline,
+                capacity=dto.capacity,
+                admission_rate=dto.admission_rate,
             )
             obj.full_clean()
             obj.save()
@@ -29,58 +380,150 @@ class EventRepository:
                 area=obj.area.name if obj.area else "",
                 event_datetime=obj.event_datetime,
                 registration_deadline=obj.registration_deadline,
+                capacity=obj.capacity,
+                admission_rate=obj.admission_rate,
             )
         except EventAreaModel.DoesNotExist as exc:
             raise ValidationError({"area": ["Event area does not exist."]}) from exc
         except ValidationError:
             raise
 
-    def get_queryset(self, name_filter: str | None = None, order_by: str | None = None):
-        queryset = self.model.objects.filter(status="open").select_related("area")
+    def bulk_create(self, dtos: list[EventDTO]) -> list[EventDTO]:
+        objs = self.model.objects.bulk_create(
+            self.model(
+                name=dto.name,
+                status=dto.status,
+                area_id=dto.area_id,
+                event_datetime=dto.event_datetime,
+                registration_deadline=dto.registration_deadline,
+                capacity=dto.capacity,
+                admission_rate=dto.admission_rate,
+            )
+            for dto in dtos
+        )
+        return [
+            EventDTO(
+                id=obj.id,
+                name=obj.name,
+                status=obj.status,
+                area_id=obj.area_id,
+                event_datetime=obj.event_datetime,
+                registration_deadline=obj.registration_deadline,
+                capacity=obj.capacity,
+                admission_rate=obj.admission_rate,
+            )
+            for obj in objs
+        ]
+
+    def get_queryset(
+        self,
+        name_filter: str | None = None,
+        order_by: str | None = None,
+        upcoming_from: datetime | None = None,
+        filters: EventFilterDTO | None = None,
+    ):
+        # Open-event scans and orderings are served by the partial indexes
+        # idx_event_open_datetime (event_datetime, id) and, with an area
+        # filter, idx_event_open_area_datetime (area_id, event_datetime, id)
+        queryset = self.model.objects.filter(status="open").values_list(
+            *self.list_fields,
+            named=True,
+        )
+
+        if upcoming_from is not None:
+            queryset = queryset.filter(event_datetime__gte=upcoming_from)
+            order_by = order_by or "asc"
+
+        if filters is not None:
+            if filters.area_id is not None:
+                queryset = queryset.filter(area_id=filters.area_id)
+            if filters.starts_from is not None:
+                queryset = queryset.filter(event_datetime__gte=filters.starts_from)
+            if filters.starts_before is not None:
+                queryset = queryset.filter(event_datetime__lt=filters.starts_before)
 
         if name_filter:
-            search_vector = SearchVector("name")
-            search_query = SearchQuery(name_filter)
+            search_query = SearchQuery(name_filter, config=SEARCH_CONFIG)
             queryset = (
-                queryset.annotate(
-                    search=search_vector,
-                    rank=SearchRank(search_vector, search_query),
-                )
-                .filter(search=search_query)
+                queryset.filter(search_vector=search_query)
+                .annotate(rank=SearchRank(F("search_vector"), search_query))
                 .order_by("-rank", "-event_datetime")
             )
 
         if order_by:
             if order_by.lower() == "asc":
-                queryset = queryset.order_by("event_datetime")
+                queryset = queryset.order_by("event_datetime", "id")
             elif order_by.lower() == "desc":
-                queryset = queryset.order_by("-event_datetime")
+                queryset = queryset.order_by("-event_datetime", "-id")
         else:
-            queryset = queryset.order_by("-event_datetime")
+            queryset = queryset.order_by("-event_datetime", "-id")
 
         return queryset
 
     def get_list(self, queryset=None) -> list[EventDTO]:
         if queryset is None:
             queryset = self.get_queryset()
-        events = [
-            EventDTO(
-                id=obj.id,
-                name=obj.name,
-                status=obj.status,
-                area_id=obj.area_id,
-                area=obj.area.name if obj.area else "",
-                event_datetime=obj.event_datetime,
-                registration_deadline=obj.registration_deadline,
-            )
-            for obj in queryset
-        ]
-        return events
+        return [self._row_to_dto(row) for row in queryset]
+
+    def iter_list(self, queryset=None, chunk_size: int = 2000) -> Iterator[EventDTO]:
+        if queryset is None:
+            queryset = self.get_queryset()
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield self._row_to_dto(row)
+
+    @staticmethod
+    def _row_to_dto(row) -> EventDTO:
+        return EventDTO(
+            id=row.id,
+            name=row.name,
+            status=row.status,
+            area_id=row.area_id,
+            area=row.area__name or "",
+            event_datetime=row.event_datetime,
+            registration_deadline=row.registration_deadline,
+        )
+
+    def get_state(self, version: int) -> EventsStateDTO:
+        events = self.model.objects.aggregate(
+            count=Count("id"),
+            updated_at=Max("updated_at"),
+        )
+        areas = EventAreaModel.objects.aggregate(updated_at=Max("updated_at"))
+        return EventsStateDTO(
+            version=version,
+            events_count=events["count"],
+            events_updated_at=events["updated_at"],
+            areas_updated_at=areas["updated_at"],
+        )
+
+    def autocomplete(self, term: str, limit: int) -> list[SuggestionDTO]:
+        return _suggest(self.model.objects.filter(status="open"), term, limit)
 
     def get_open_events(self, event_id: UUID) -> bool:
-        if not self.model.objects.filter(status="open", id=event_id):
-            return False
-        return True
+        return self.model.objects.filter(
+            status="open",
+            registration_deadline__gt=Now(),
+            id=event_id,
+        ).exists()
+
+    def exists(self, event_id: UUID) -> bool:
+        return self.model.objects.filter(id=event_id).exists()
+
+    def get_admission_rate(self, event_id: UUID) -> int | None:
+        return (
+            self.model.objects.filter(
+                status="open",
+                registration_deadline__gt=Now(),
+                id=event_id,
+            )
+            .values_list("admission_rate", flat=True)
+            .first()
+        )
+
+    def close_expired(self, now: datetime, batch_size: int) -> int:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(CLOSE_EXPIRED_EVENTS_SQL, {"now": now, "limit": batch_size})
+            return cursor.rowcount
 
 
 class EventAreaRepository:
@@ -95,9 +538,18 @@ class EventAreaRepository:
         except ValidationError:
             raise
 
+    def get_names(self, ids: set[UUID]) -> dict[UUID, str]:
+        if not ids:
+            return {}
+        return dict(self.model.objects.filter(id__in=ids).values_list("id", "name"))
+
+    def autocomplete(self, term: str, limit: int) -> list[SuggestionDTO]:
+        return _suggest(self.model.objects.all(), term, limit)
+
 
 class VisitorRepository:
     model = VisitorModel
+    list_fields = ("id", "full_name", "email", "registered_at")
 
     def create(self, dto: VisitorDTO) -> VisitorDTO:
         try:
@@ -120,7 +572,321 @@ class VisitorRepository:
         except Exception:
             raise
 
+    def register(
+        self,
+        dto: VisitorDTO,
+        notification: NotificationDTO,
+    ) -> RegistrationResultDTO:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                REGISTER_VISITOR_SQL,
+                {
+                    "event_id": dto.event_id,
+                    "visitor_id": dto.id,
+                    "full_name": dto.full_name,
+                    "email": dto.email,
+                    "notification_id": uuid.uuid4(),
+                    "topic": notification.topic,
+                    "payload": json.dumps(notification.payload),
+                },
+            )
+            event_open, created, limited, deadline_passed, queued = cursor.fetchone()
+        return RegistrationResultDTO(
+            event_open=event_open,
+            created=created,
+            limited=limited,
+            deadline_passed=deadline_passed,
+            queued=queued,
+        )
+
+    def register_group(
+        self,
+        event_id: UUID,
+        dtos: list[VisitorDTO],
+    ) -> GroupRegistrationResultDTO:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                REGISTER_GROUP_SQL,
+                {
+                    "event_id": event_id,
+                    "ids": [str(dto.id) for dto in dtos],
+                    "full_names": [dto.full_name for dto in dtos],
+                    "emails": [dto.email for dto in dtos],
+                },
+            )
+            event_open, limited, deadline_passed, queued, created = cursor.fetchone()
+        return GroupRegistrationResultDTO(
+            event_open=event_open,
+            limited=limited,
+            deadline_passed=deadline_passed,
+            queued=queued,
+            created={UUID(visitor_id) for visitor_id in created},
+        )
+
+    def delete(self, ids: list[UUID]) -> None:
+        self.model.objects.filter(id__in=ids).delete()
+
+    def exists(self, visitor_id: UUID) -> bool:
+        return self.model.objects.filter(id=visitor_id).exists()
+
     def is_visitor_registered(self, dto: VisitorDTO) -> bool:
-        if self.model.objects.filter(email=dto.email, event_id=dto.event_id).first():
-            return True
-        return False
+        return self.model.objects.filter(
+            email=dto.email,
+            event_id=dto.event_id,
+        ).exists()
+
+    def import_csv(
+        self,
+        event_id: UUID,
+        stream: IO,
+        topic: str,
+        limit: int | None = None,
+    ) -> VisitorImportResultDTO:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(CREATE_VISITOR_IMPORT_SQL)
+            try:
+                # copy_expert bypasses the cursor wrapper's error translation
+                with connection.wrap_database_errors:
+                    cursor.copy_expert(COPY_VISITOR_IMPORT_SQL, stream)
+            except DataError as exc:
+                raise InvalidVisitorImportError(detail=str(exc).splitlines()[0])
+            cursor.execute(
+                IMPORT_VISITORS_SQL,
+                {"event_id": event_id, "topic": topic, "limit": limit},
+            )
+            rows, valid, fresh, imported = cursor.fetchone()
+        return VisitorImportResultDTO(
+            rows=rows,
+            invalid=rows - valid,
+            duplicates=valid - fresh,
+            over_capacity=fresh - imported,
+            imported=imported,
+        )
+
+    def get_event_queryset(self, event_id: UUID):
+        # Keyset pages and exports of one event are served by
+        # idx_visitor_event_keyset (event_id, -registered_at, -id)
+        return self.model.objects.filter(event_id=event_id).values_list(
+            *self.list_fields,
+            named=True,
+        )
+
+    def get_list(self, queryset) -> list[RegisteredVisitorDTO]:
+        return [self._row_to_dto(row) for row in queryset]
+
+    def iter_list(
+        self,
+        queryset,
+        chunk_size: int = 2000,
+    ) -> Iterator[RegisteredVisitorDTO]:
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield self._row_to_dto(row)
+
+    @staticmethod
+    def _row_to_dto(row) -> RegisteredVisitorDTO:
+        return RegisteredVisitorDTO(
+            id=row.id,
+            full_name=row.full_name,
+            email=row.email,
+            registered_at=row.registered_at,
+        )
+
+    def get_email_queryset(self, email: str):
+        # Served by idx_visitor_email, one person has few registrations
+        return self.model.objects.filter(email=email).values_list(
+            "id",
+            "full_name",
+            "email",
+            "registered_at",
+            "event_id",
+            "event_id__name",
+            "event_id__event_datetime",
+            named=True,
+        )
+
+    def get_registrations(self, queryset) -> list[VisitorRegistrationDTO]:
+        return [
+            VisitorRegistrationDTO(
+                id=row.id,
+                full_name=row.full_name,
+                email=row.email,
+                registered_at=row.registered_at,
+                event_id=row.event_id,
+                event_name=row.event_id__name,
+                event_datetime=row.event_id__event_datetime,
+            )
+            for row in queryset
+        ]
+
+    def iter_emails(self, event_id: UUID, chunk_size: int = 5000) -> Iterator[str]:
+        return (
+            self.model.objects.filter(event_id=event_id)
+            .order_by()
+            .values_list("email", flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+
+
+class WaitlistRepository:
+    model = WaitlistEntryModel
+
+    def add(self, event_id: UUID, dtos: list[VisitorDTO]) -> dict[str, int | None]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                ADD_TO_WAITLIST_SQL,
+                {
+                    "event_id": event_id,
+                    "full_names": [dto.full_name for dto in dtos],
+                    "emails": [dto.email for dto in dtos],
+                },
+            )
+            return dict(cursor.fetchall())
+
+    def get_positions(self, event_id: UUID, emails: list[str]) -> dict[str, int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                WAITLIST_POSITIONS_SQL,
+                {"event_id": event_id, "emails": emails},
+            )
+            return dict(cursor.fetchall())
+
+    def get_promotable_events(self, event_ids: list[UUID] | None = None) -> list[UUID]:
+        # Open events with someone waiting and a seat free, or no limit left
+        free_shards = EventSeatShardModel.objects.filter(
+            event_id=OuterRef("pk"),
+            taken__lt=F("capacity"),
+        )
+        events = EventModel.objects.all()
+        if event_ids is not None:
+            events = events.filter(id__in=event_ids)
+        return list(
+            events.filter(
+                Q(capacity__isnull=True) | Exists(free_shards),
+                Exists(self.model.objects.filter(event_id=OuterRef("pk"))),
+                status="open",
+                registration_deadline__gt=Now(),
+            )
+            .order_by()
+            .values_list("id", flat=True)
+        )
+
+    def promote(self, event_id: UUID, limit: int) -> list[VisitorDTO]:
+        with connection.cursor() as cursor:
+            cursor.execute(PROMOTE_WAITLIST_SQL, {"event_id": event_id, "limit": limit})
+            return [
+                VisitorDTO(
+                    id=visitor_id, full_name=full_name, email=email, event_id=event_id
+                )
+                for visitor_id, full_name, email in cursor.fetchall()
+            ]
+
+
+class EventSeatRepository:
+    model = EventSeatShardModel
+
+    @staticmethod
+    def split(capacity: int, taken: int, shards: int) -> list[tuple[int, int]]:
+        # Free seats are spread evenly so every shard stays claimable
+        count = max(1, min(shards, capacity))
+        base, extra = divmod(capacity, count)
+        free_base, free_extra = divmod(capacity - taken, count)
+        result = []
+        for index in range(count):
+            shard_capacity = base + (1 if index < extra else 0)
+            shard_free = free_base + (1 if index < free_extra else 0)
+            result.append((shard_capacity, shard_capacity - shard_free))
+        return result
+
+    def allocate(self, events: list[EventDTO], shards: int) -> None:
+        self.model.objects.bulk_create(
+            self.model(
+                event_id=event.id,
+                shard=index,
+                capacity=shard_capacity,
+                taken=shard_taken,
+            )
+            for event in events
+            if event.capacity is not None
+            for index, (shard_capacity, shard_taken) in enumerate(
+                self.split(event.capacity, 0, shards),
+            )
+        )
+
+    def lock_free_seats(self, event_id: UUID) -> int | None:
+        # Holds the event and its shards until commit, so seat claims wait
+        try:
+            capacity = (
+                EventModel.objects.select_for_update(no_key=True)
+                .values_list("capacity", flat=True)
+                .get(id=event_id)
+            )
+        except EventModel.DoesNotExist as exc:
+            raise EventNotFoundError from exc
+        if capacity is None:
+            return None
+        list(
+            self.model.objects.select_for_update()
+            .filter(event_id=event_id)
+            .order_by("shard")
+            .values_list("id", flat=True)
+        )
+        registered = VisitorModel.objects.filter(event_id=event_id).count()
+        return max(capacity - registered, 0)
+
+    def claim(self, event_id: UUID) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_SEAT_SQL, [event_id])
+            if cursor.fetchone() is not None:
+                return True
+            cursor.execute(CLAIM_SEAT_BLOCKING_SQL, [event_id])
+            return cursor.fetchone() is not None
+
+    def claim_many(self, event_id: UUID, count: int) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_SEATS_SQL, {"event_id": event_id, "count": count})
+            return sum(seats for (seats,) in cursor.fetchall())
+
+    def rebalance(self, event_id: UUID, shards: int) -> None:
+        with transaction.atomic():
+            # NO KEY UPDATE serializes rebalances without blocking the
+            # visitor inserts that reference the event
+            capacity = (
+                EventModel.objects.select_for_update(no_key=True)
+                .values_list("capacity", flat=True)
+                .get(id=event_id)
+            )
+            existing = {
+                shard.shard: shard
+                for shard in self.model.objects.select_for_update()
+                .filter(event_id=event_id)
+                .order_by("shard")
+            }
+            if capacity is None:
+                self.model.objects.filter(event_id=event_id).delete()
+                return
+
+            # Counted after the shard locks, so in-flight claims are settled
+            registered = VisitorModel.objects.filter(event_id=event_id).count()
+            layout = self.split(capacity, min(registered, capacity), shards)
+
+            self.model.objects.filter(
+                event_id=event_id,
+                shard__gte=len(layout),
+            ).delete()
+            changed, created = [], []
+            for index, (shard_capacity, shard_taken) in enumerate(layout):
+                shard = existing.get(index)
+                if shard is None:
+                    created.append(
+                        self.model(
+                            event_id=event_id,
+                            shard=index,
+                            capacity=shard_capacity,
+                            taken=shard_taken,
+                        ),
+                    )
+                elif (shard.capacity, shard.taken) != (shard_capacity, shard_taken):
+                    shard.capacity, shard.taken = shard_capacity, shard_taken
+                    changed.append(shard)
+            self.model.objects.bulk_update(changed, ["capacity", "taken"])
+            self.model.objects.bulk_create(created)
@@ -1,4 +1,5 @@
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from datetime import datetime, time, timedelta, tzinfo
 from uuid import UUID
 
 from django.utils import timezone
@@ -6,7 +7,23 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
-from .dto import EventAreaDTO, EventDTO, VisitorDTO
+from .dto import (
+    AdmissionDTO,
+    AutocompleteQueryDTO,
+    AutocompleteResultDTO,
+    BulkItemResultDTO,
+    EventAreaDTO,
+    EventDTO,
+    EventExportQueryDTO,
+    EventFilterDTO,
+    GroupMemberResultDTO,
+    RegisteredVisitorDTO,
+    RegistrationTicketDTO,
+    SuggestionDTO,
+    VisitorDTO,
+    VisitorRegistrationDTO,
+    WaitlistEntryDTO,
+)
 from .models import EventAreaModel, EventModel
 
 
@@ -76,6 +93,16 @@ class EventBaseSerializer(serializers.Serializer):
         input_formats=["%m.%d.%Y"],
         default_timezone=timezone.get_current_timezone(),
     )
+    capacity = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        allow_null=True,
+    )
+    admission_rate = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        allow_null=True,
+    )
 
     @staticmethod
     def validate_event_datetime(value: datetime) -> datetime:
@@ -86,7 +113,41 @@ class EventBaseSerializer(serializers.Serializer):
         return value
 
 
+class _InvalidItem:
+    def __init__(self, detail):
+        self.detail = detail
+
+
+class BulkItemListSerializer(serializers.ListSerializer):
+    # Invalid items are kept in place instead of failing the whole list, so
+    # the valid ones can still be processed and each item gets its own result
+    def run_child_validation(self, data):
+        try:
+            return super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            return _InvalidItem(exc.detail)
+
+    @property
+    def item_errors(self) -> dict[int, dict]:
+        return {
+            index: item.detail
+            for index, item in enumerate(self.validated_data)
+            if isinstance(item, _InvalidItem)
+        }
+
+
+class EventBulkListSerializer(BulkItemListSerializer):
+    def to_dtos(self) -> list[EventDTO | None]:
+        return [
+            None if isinstance(item, _InvalidItem) else EventDTO(**item)
+            for item in self.validated_data
+        ]
+
+
 class EventRequestSerializer(EventBaseSerializer):
+    class Meta:
+        list_serializer_class = EventBulkListSerializer
+
     def to_dto(self) -> EventDTO:
         return EventDTO(**self.validated_data)
 
@@ -141,9 +202,343 @@ class EventResponseSerializer(serializers.Serializer):
         return None
 
 
+class EventResponseEncoder:
+    datetime_format = "%m.%d.%Y"
+
+    def __init__(self, data: dict | list[dict]):
+        self.data = data
+
+    @classmethod
+    def encode(cls, dto: EventDTO, tz: tzinfo | None = None) -> dict:
+        tz = tz or timezone.get_current_timezone()
+        payload = {
+            "id": str(dto.id),
+            "name": dto.name,
+            "area": dto.area,
+            "status": dto.status,
+            "event_datetime": cls._format_datetime(dto.event_datetime, tz),
+            "registration_deadline": cls._format_datetime(
+                dto.registration_deadline,
+                tz,
+            ),
+        }
+        if not dto.area:
+            payload.pop("area")
+        return payload
+
+    @classmethod
+    def _format_datetime(cls, value: datetime | None, tz: tzinfo) -> str | None:
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(tz)
+        return value.strftime(cls.datetime_format)
+
+    @classmethod
+    def from_dto(cls, dto: EventDTO) -> "EventResponseEncoder":
+        return cls(data=cls.encode(dto))
+
+    @classmethod
+    def from_dtos(cls, dtos: list[EventDTO]) -> "EventResponseEncoder":
+        tz = timezone.get_current_timezone()
+        encode = cls.encode
+        return cls(data=[encode(dto, tz) for dto in dtos])
+
+    @classmethod
+    def iter_encode(cls, dtos: Iterable[EventDTO]) -> Iterator[dict]:
+        # The timezone is resolved now, the rows are encoded while streaming
+        tz = timezone.get_current_timezone()
+        encode = cls.encode
+        return (encode(dto, tz) for dto in dtos)
+
+
+class VisitorResponseEncoder:
+    def __init__(self, data: list[dict]):
+        self.data = data
+
+    @staticmethod
+    def encode(dto: RegisteredVisitorDTO) -> dict:
+        return {
+            "id": str(dto.id),
+            "full_name": dto.full_name,
+            "email": dto.email,
+            "registered_at": dto.registered_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dtos(cls, dtos: list[RegisteredVisitorDTO]) -> "VisitorResponseEncoder":
+        return cls(data=[cls.encode(dto) for dto in dtos])
+
+    @classmethod
+    def iter_encode(cls, dtos: Iterable[RegisteredVisitorDTO]) -> Iterator[dict]:
+        return map(cls.encode, dtos)
+
+
+class EventListFilterSerializer(serializers.Serializer):
+    area_id = serializers.UUIDField(required=False)
+    date_from = serializers.DateField(
+        required=False,
+        input_formats=["%m.%d.%Y", "iso-8601"],
+    )
+    date_to = serializers.DateField(
+        required=False,
+        input_formats=["%m.%d.%Y", "iso-8601"],
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        date_from, date_to = attrs.get("date_from"), attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError(
+                {"date_to": _("date_to cannot be earlier than date_from.")},
+            )
+        return attrs
+
+    def to_dto(self) -> EventFilterDTO:
+        tz = timezone.get_current_timezone()
+        date_from = self.validated_data.get("date_from")
+        date_to = self.validated_data.get("date_to")
+        # date_to is inclusive, so the range ends before the following midnight
+        return EventFilterDTO(
+            area_id=self.validated_data.get("area_id"),
+            starts_from=(
+                datetime.combine(date_from, time.min, tzinfo=tz) if date_from else None
+            ),
+            starts_before=(
+                datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=tz)
+                if date_to
+                else None
+            ),
+        )
+
+
+class EventExportRequestSerializer(serializers.Serializer):
+    export_format = serializers.ChoiceField(
+        choices=["ndjson", "csv"],
+        default="ndjson",
+        required=False,
+    )
+    name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    order_by = serializers.ChoiceField(choices=["asc", "desc"], required=False)
+
+    def to_dto(self) -> EventExportQueryDTO:
+        return EventExportQueryDTO(**self.validated_data)
+
+
+def _encode_item_errors(errors: dict) -> list[dict]:
+    return [
+        {"field": field, "messages": messages} for field, messages in errors.items()
+    ]
+
+
+class EventBulkResponseEncoder:
+    def __init__(self, data: list[dict]):
+        self.data = data
+
+    @classmethod
+    def from_results(
+        cls,
+        results: list[BulkItemResultDTO],
+    ) -> "EventBulkResponseEncoder":
+        tz = timezone.get_current_timezone()
+        data = []
+        for result in results:
+            if result.event is not None:
+                data.append(
+                    {
+                        "index": result.index,
+                        "status": "created",
+                        "event": EventResponseEncoder.encode(result.event, tz),
+                    },
+                )
+            else:
+                data.append(
+                    {
+                        "index": result.index,
+                        "status": "failed",
+                        "errors": _encode_item_errors(result.errors),
+                    },
+                )
+        return cls(data=data)
+
+
+class LowercaseEmailField(serializers.EmailField):
+    # Emails are stored lowercase, so lookups and the per-event unique
+    # constraint see one spelling per address
+    def to_internal_value(self, data) -> str:
+        return super().to_internal_value(data).lower()
+
+
+class GroupSignUpListSerializer(BulkItemListSerializer):
+    def to_dtos(self, event_id: UUID) -> list[VisitorDTO | None]:
+        return [
+            None
+            if isinstance(item, _InvalidItem)
+            else VisitorDTO(**item, event_id=event_id)
+            for item in self.validated_data
+        ]
+
+
 class SignUpForEventRequestSerializer(serializers.Serializer):
     full_name = serializers.CharField(max_length=128, required=True)
-    email = serializers.EmailField(required=True)
+    email = LowercaseEmailField(required=True)
+
+    class Meta:
+        list_serializer_class = GroupSignUpListSerializer
 
     def to_dto(self, event_id: UUID) -> VisitorDTO:
         return VisitorDTO(**self.validated_data, event_id=event_id)
+
+
+class GroupSignUpResponseEncoder:
+    def __init__(self, data: list[dict]):
+        self.data = data
+
+    @classmethod
+    def from_members(
+        cls,
+        members: list[GroupMemberResultDTO],
+    ) -> "GroupSignUpResponseEncoder":
+        data = []
+        for member in members:
+            if member.visitor is not None:
+                data.append(
+                    {
+                        "index": member.index,
+                        "status": "registered",
+                        "visitor": {
+                            "id": str(member.visitor.id),
+                            "full_name": member.visitor.full_name,
+                            "email": member.visitor.email,
+                        },
+                    },
+                )
+            elif member.waitlist is not None:
+                data.append(
+                    {
+                        "index": member.index,
+                        "status": "waitlisted",
+                        "waitlist": WaitlistEntryResponseEncoder.from_dto(
+                            dto=member.waitlist,
+                        ).data,
+                    },
+                )
+            else:
+                data.append(
+                    {
+                        "index": member.index,
+                        "status": "failed",
+                        "errors": _encode_item_errors(member.errors),
+                    },
+                )
+        return cls(data=data)
+
+
+class WaitlistEntryResponseEncoder:
+    def __init__(self, data: dict):
+        self.data = data
+
+    @classmethod
+    def from_dto(cls, dto: WaitlistEntryDTO) -> "WaitlistEntryResponseEncoder":
+        return cls(
+            data={
+                "event_id": str(dto.event_id),
+                "email": dto.email,
+                "position": dto.position,
+            },
+        )
+
+
+class RegistrationLookupRequestSerializer(serializers.Serializer):
+    email = LowercaseEmailField(required=True)
+
+
+class VisitorRegistrationResponseEncoder:
+    def __init__(self, data: list[dict]):
+        self.data = data
+
+    @staticmethod
+    def encode(dto: VisitorRegistrationDTO) -> dict:
+        return {
+            "id": str(dto.id),
+            "full_name": dto.full_name,
+            "email": dto.email,
+            "registered_at": dto.registered_at.isoformat(),
+            "event": {
+                "id": str(dto.event_id),
+                "name": dto.event_name,
+                "event_datetime": dto.event_datetime.isoformat(),
+            },
+        }
+
+    @classmethod
+    def from_dtos(
+        cls,
+        dtos: list[VisitorRegistrationDTO],
+    ) -> "VisitorRegistrationResponseEncoder":
+        return cls(data=[cls.encode(dto) for dto in dtos])
+
+
+class AutocompleteRequestSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, required=True, trim_whitespace=True)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=20,
+        default=10,
+        required=False,
+    )
+
+    def to_dto(self) -> AutocompleteQueryDTO:
+        term = " ".join(self.validated_data["q"].split()).lower()
+        return AutocompleteQueryDTO(term=term, limit=self.validated_data["limit"])
+
+
+class AutocompleteResponseEncoder:
+    def __init__(self, data: dict):
+        self.data = data
+
+    @staticmethod
+    def _encode(suggestions: list[SuggestionDTO]) -> list[dict]:
+        return [{"id": str(item.id), "name": item.name} for item in suggestions]
+
+    @classmethod
+    def from_dto(cls, dto: AutocompleteResultDTO) -> "AutocompleteResponseEncoder":
+        return cls(
+            data={
+                "events": cls._encode(dto.events),
+                "areas": cls._encode(dto.areas),
+            },
+        )
+
+
+class AdmissionResponseEncoder:
+    def __init__(self, data: dict):
+        self.data = data
+
+    @classmethod
+    def from_dto(cls, dto: AdmissionDTO) -> "AdmissionResponseEncoder":
+        return cls(
+            data={
+                "admitted": dto.admitted,
+                "token": dto.token,
+                "position": dto.position,
+                "retry_after": dto.retry_after,
+            },
+        )
+
+
+class RegistrationTicketResponseEncoder:
+    def __init__(self, data: dict):
+        self.data = data
+
+    @classmethod
+    def from_dto(
+        cls, dto: RegistrationTicketDTO
+    ) -> "RegistrationTicketResponseEncoder":
+        return cls(
+            data={
+                "ticket_id": str(dto.id),
+                "event_id": str(dto.event_id),
+                "status": dto.status,
+                "error": dto.error,
+            },
+        )
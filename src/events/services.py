@@ -1,50 +1,312 @@
-from uuid import UUID
+from collections.abc import Iterator
+from dataclasses import replace
+from datetime import datetime
+from functools import partial
+from typing import IO
+from uuid import UUID, uuid4
 
 from django.db import transaction
+from django.utils import timezone
 
+from ..common.exceptions import BaseServiceException
+from ..core.settings import EVENTS_SEAT_SHARDS
 from ..notifications.dto import NotificationDTO
 from ..notifications.services import NotificationsServiceProtocol
 from ..notifications.utils import generate_code
-from .dto import EventAreaDTO, EventDTO, VisitorDTO
-from .exceptions import DuplicateRegistrationError, EventClosedError
-from .repository import EventAreaRepository, EventRepository, VisitorRepository
+from .bloom import RegistrationBloomFilter
+from .cache import EventsCache
+from .dto import (
+    EventAreaDTO,
+    EventDTO,
+    EventFilterDTO,
+    EventsStateDTO,
+    GroupRegistrationResultDTO,
+    RegisteredVisitorDTO,
+    RegistrationResultDTO,
+    SuggestionDTO,
+    VisitorDTO,
+    VisitorImportResultDTO,
+    VisitorRegistrationDTO,
+    WaitlistEntryDTO,
+)
+from .exceptions import (
+    DuplicateRegistrationError,
+    EventClosedError,
+    EventFullError,
+    EventNotFoundError,
+    RegistrationDeadlinePassedError,
+)
+from .repository import (
+    EventAreaRepository,
+    EventRepository,
+    EventSeatRepository,
+    VisitorRepository,
+    WaitlistRepository,
+)
+
+SIGNING_TOPIC = "event_signing"
+
+
+class SeatService:
+    def __init__(self, repository: EventSeatRepository):
+        self.repository = repository
+
+    def allocate(self, events: list[EventDTO]) -> None:
+        self.repository.allocate(events=events, shards=EVENTS_SEAT_SHARDS)
+
+    def claim(self, event_id: UUID) -> bool:
+        return self.repository.claim(event_id=event_id)
+
+    def claim_many(self, event_id: UUID, count: int) -> int:
+        return self.repository.claim_many(event_id=event_id, count=count)
+
+    def rebalance(self, event_id: UUID) -> None:
+        self.repository.rebalance(event_id=event_id, shards=EVENTS_SEAT_SHARDS)
+
+    def lock_free_seats(self, event_id: UUID) -> int | None:
+        return self.repository.lock_free_seats(event_id=event_id)
 
 
 class EventsService:
-    def __init__(self, repository: EventRepository):
+    def __init__(
+        self,
+        repository: EventRepository,
+        cache: EventsCache,
+        seat_service: SeatService,
+    ):
         self.repository = repository
+        self.cache = cache
+        self.seat_service = seat_service
 
     def create_event(self, dto: EventDTO) -> EventDTO:
-        return self.repository.create(dto=dto)
+        with transaction.atomic():
+            event = self.repository.create(dto=dto)
+            self.seat_service.allocate(events=[event])
+            self.cache.bump_version_on_commit()
+        return event
+
+    def create_events(self, dtos: list[EventDTO]) -> list[EventDTO]:
+        if not dtos:
+            return []
+        with transaction.atomic():
+            events = self.repository.bulk_create(dtos=dtos)
+            self.seat_service.allocate(events=events)
+            self.cache.bump_version_on_commit()
+        return events
 
-    def get_queryset(self, name_filter: str | None = None, order_by: str | None = None):
-        return self.repository.get_queryset(name_filter=name_filter, order_by=order_by)
+    def close_expired(self, batch_size: int) -> int:
+        # Each batch commits on its own so no run holds many row locks
+        now = timezone.now()
+        closed = 0
+        while True:
+            batch = self.repository.close_expired(now=now, batch_size=batch_size)
+            closed += batch
+            if batch < batch_size:
+                break
+        if closed:
+            self.cache.bump_version()
+        return closed
+
+    def get_queryset(
+        self,
+        name_filter: str | None = None,
+        order_by: str | None = None,
+        upcoming_from: datetime | None = None,
+        filters: EventFilterDTO | None = None,
+    ):
+        return self.repository.get_queryset(
+            name_filter=name_filter,
+            order_by=order_by,
+            upcoming_from=upcoming_from,
+            filters=filters,
+        )
 
     def get_events(self, queryset=None) -> list[EventDTO]:
         return self.repository.get_list(queryset=queryset)
 
+    def iter_events(self, queryset=None, chunk_size: int = 2000) -> Iterator[EventDTO]:
+        return self.repository.iter_list(queryset=queryset, chunk_size=chunk_size)
+
+    def get_state(self) -> EventsStateDTO:
+        return self.repository.get_state(version=self.cache.get_version())
+
+    def exists(self, event_id: UUID) -> bool:
+        return self.repository.exists(event_id=event_id)
+
     def check_event_status(self, event_id: UUID) -> bool:
         return self.repository.get_open_events(event_id=event_id)
 
+    def get_admission_rate(self, event_id: UUID) -> int | None:
+        return self.repository.get_admission_rate(event_id=event_id)
+
+    def autocomplete(self, term: str, limit: int) -> list[SuggestionDTO]:
+        return self.repository.autocomplete(term=term, limit=limit)
+
 
 class AreaService:
-    def __init__(self, repository: EventAreaRepository):
+    def __init__(self, repository: EventAreaRepository, cache: EventsCache):
         self.repository = repository
+        self.cache = cache
 
     def create_area(self, dto: EventAreaDTO) -> EventAreaDTO:
-        return self.repository.create(dto=dto)
+        area = self.repository.create(dto=dto)
+        self.cache.bump_version_on_commit()
+        return area
+
+    def get_area_names(self, ids: set[UUID]) -> dict[UUID, str]:
+        return self.repository.get_names(ids=ids)
+
+    def autocomplete(self, term: str, limit: int) -> list[SuggestionDTO]:
+        return self.repository.autocomplete(term=term, limit=limit)
 
 
 class VisitorService:
-    def __init__(self, repository: VisitorRepository):
+    def __init__(self, repository: VisitorRepository, bloom: RegistrationBloomFilter):
         self.repository = repository
+        self.bloom = bloom
+
+    def is_duplicate(self, dto: VisitorDTO) -> bool:
+        # Only a Bloom filter hit costs a query; a miss proves the email is new
+        maybe = self.bloom.might_contain(event_id=dto.event_id, email=dto.email)
+        if maybe is None:
+            self.bloom.rebuild(
+                event_id=dto.event_id,
+                emails=self.repository.iter_emails(event_id=dto.event_id),
+            )
+            return False
+        if not maybe:
+            return False
+        registered = self.repository.is_visitor_registered(dto=dto)
+        self.bloom.record("duplicates" if registered else "false_positives")
+        return registered
+
+    def remember(self, dto: VisitorDTO) -> None:
+        transaction.on_commit(
+            partial(self.bloom.add, event_id=dto.event_id, email=dto.email),
+        )
+
+    def get_event_queryset(self, event_id: UUID):
+        return self.repository.get_event_queryset(event_id=event_id)
+
+    def get_visitors(self, queryset) -> list[RegisteredVisitorDTO]:
+        return self.repository.get_list(queryset=queryset)
+
+    def iter_visitors(
+        self,
+        queryset,
+        chunk_size: int = 2000,
+    ) -> Iterator[RegisteredVisitorDTO]:
+        return self.repository.iter_list(queryset=queryset, chunk_size=chunk_size)
+
+    def get_email_queryset(self, email: str):
+        return self.repository.get_email_queryset(email=email)
+
+    def get_registrations(self, queryset) -> list[VisitorRegistrationDTO]:
+        return self.repository.get_registrations(queryset=queryset)
 
     def sign_in(self, dto: VisitorDTO) -> VisitorDTO:
         return self.repository.create(dto=dto)
 
+    def register(
+        self,
+        dto: VisitorDTO,
+        notification: NotificationDTO,
+    ) -> RegistrationResultDTO:
+        return self.repository.register(dto=dto, notification=notification)
+
+    def register_group(
+        self,
+        event_id: UUID,
+        dtos: list[VisitorDTO],
+    ) -> GroupRegistrationResultDTO:
+        return self.repository.register_group(event_id=event_id, dtos=dtos)
+
+    def delete(self, ids: list[UUID]) -> None:
+        self.repository.delete(ids=ids)
+
     def check_visitor_registration(self, dto: VisitorDTO) -> bool:
         return self.repository.is_visitor_registered(dto=dto)
 
+    def exists(self, visitor_id: UUID) -> bool:
+        return self.repository.exists(visitor_id=visitor_id)
+
+
+def make_signing_notification(visitor_dto: VisitorDTO) -> NotificationDTO:
+    return NotificationDTO(
+        topic=SIGNING_TOPIC,
+        payload={
+            "owner_id": str(visitor_dto.id),
+            "email": visitor_dto.email,
+            "message": f"{generate_code()}",
+        },
+    )
+
+
+class WaitlistService:
+    def __init__(
+        self,
+        repository: WaitlistRepository,
+        visitor_service: VisitorService,
+        notifications_service: NotificationsServiceProtocol,
+        seat_service: SeatService,
+    ):
+        self.repository = repository
+        self.visitor_service = visitor_service
+        self.notifications_service = notifications_service
+        self.seat_service = seat_service
+
+    def join(
+        self,
+        event_id: UUID,
+        dtos: list[VisitorDTO],
+    ) -> list[WaitlistEntryDTO | DuplicateRegistrationError]:
+        # Joining twice keeps the first place in the queue
+        positions = self.repository.add(event_id=event_id, dtos=dtos)
+        missing = [email for email, position in positions.items() if position is None]
+        if missing:
+            # Added by a concurrent request, visible once it has committed
+            positions.update(
+                self.repository.get_positions(event_id=event_id, emails=missing),
+            )
+        # Still missing means registered, already or by a promotion meanwhile
+        return [
+            WaitlistEntryDTO(
+                event_id=event_id,
+                email=dto.email,
+                position=positions[dto.email],
+            )
+            if positions.get(dto.email) is not None
+            else DuplicateRegistrationError()
+            for dto in dtos
+        ]
+
+    def promote(self, batch_size: int, event_ids: list[UUID] | None = None) -> int:
+        promoted = 0
+        for event_id in self.repository.get_promotable_events(event_ids=event_ids):
+            try:
+                promoted += self.promote_event(event_id=event_id, batch_size=batch_size)
+            except EventNotFoundError:
+                continue
+        return promoted
+
+    def promote_event(self, event_id: UUID, batch_size: int) -> int:
+        with transaction.atomic():
+            # Locks the event and its shards like an import, so seat claims
+            # wait until the promoted visitors are counted
+            free_seats = self.seat_service.lock_free_seats(event_id=event_id)
+            limit = batch_size if free_seats is None else min(free_seats, batch_size)
+            if not limit:
+                return 0
+            visitors = self.repository.promote(event_id=event_id, limit=limit)
+            if free_seats is not None and visitors:
+                self.seat_service.rebalance(event_id=event_id)
+            self.notifications_service.create_notifications(
+                dtos=[make_signing_notification(dto) for dto in visitors],
+            )
+            for dto in visitors:
+                self.visitor_service.remember(dto=dto)
+        return len(visitors)
+
 
 class OutboxService:
     def __init__(
@@ -52,27 +314,124 @@ class OutboxService:
         visitor_service: VisitorService,
         notifications_service: NotificationsServiceProtocol,
         events_service: EventsService,
+        seat_service: SeatService,
+        waitlist_service: WaitlistService,
     ):
         self.visitor_service = visitor_service
         self.notifications_service = notifications_service
         self.events_service = events_service
+        self.seat_service = seat_service
+        self.waitlist_service = waitlist_service
 
-    def register_visitor(self, visitor_dto: VisitorDTO) -> None:
-        with transaction.atomic():
-            if not self.events_service.check_event_status(
+    def register_visitor(self, visitor_dto: VisitorDTO) -> WaitlistEntryDTO | None:
+        if self.visitor_service.is_duplicate(dto=visitor_dto):
+            raise DuplicateRegistrationError
+        visitor_dto = replace(visitor_dto, id=visitor_dto.id or uuid4())
+        notification_dto = make_signing_notification(visitor_dto)
+        try:
+            with transaction.atomic():
+                result = self.visitor_service.register(
+                    dto=visitor_dto,
+                    notification=notification_dto,
+                )
+                if not result.event_open:
+                    raise EventClosedError
+                if result.deadline_passed:
+                    raise RegistrationDeadlinePassedError
+                if result.queued:
+                    raise EventFullError
+                if not result.created:
+                    raise DuplicateRegistrationError
+                # Claimed last so the shard row lock is held only until commit
+                if result.limited and not self.seat_service.claim(
+                    event_id=visitor_dto.event_id,
+                ):
+                    raise EventFullError
+                self.visitor_service.remember(dto=visitor_dto)
+        except EventFullError:
+            # Joined once the visitor row is rolled back
+            [entry] = self.waitlist_service.join(
                 event_id=visitor_dto.event_id,
-            ):
+                dtos=[visitor_dto],
+            )
+            if isinstance(entry, DuplicateRegistrationError):
+                raise entry from None
+            return entry
+        return None
+
+    def register_group(
+        self,
+        event_id: UUID,
+        visitor_dtos: list[VisitorDTO],
+    ) -> list[VisitorDTO | WaitlistEntryDTO | BaseServiceException]:
+        dtos = [replace(dto, id=uuid4()) for dto in visitor_dtos]
+        waitlisted = {}
+        with transaction.atomic():
+            result = self.visitor_service.register_group(event_id=event_id, dtos=dtos)
+            if not result.event_open:
                 raise EventClosedError
-            if self.visitor_service.check_visitor_registration(dto=visitor_dto):
-                raise DuplicateRegistrationError
-            code = generate_code()
-            visitor = self.visitor_service.sign_in(dto=visitor_dto)
-            notification_dto = NotificationDTO(
-                topic="event_signing",
-                payload={
-                    "owner_id": str(visitor.id),
-                    "email": visitor.email,
-                    "message": f"{code}",
-                },
+            if result.deadline_passed:
+                raise RegistrationDeadlinePassedError
+            created = [dto for dto in dtos if dto.id in result.created]
+            full = []
+            if result.queued:
+                # People are already waiting, so the group queues behind them
+                full = dtos
+            elif result.limited and created:
+                seats = self.seat_service.claim_many(
+                    event_id=event_id,
+                    count=len(created),
+                )
+                # Members are seated in request order, the rest are removed
+                # and put on the waitlist
+                full = created[seats:]
+                if full:
+                    self.visitor_service.delete(ids=[dto.id for dto in full])
+                    created = created[:seats]
+            if full:
+                entries = self.waitlist_service.join(event_id=event_id, dtos=full)
+                waitlisted = {
+                    dto.id: entry for dto, entry in zip(full, entries, strict=True)
+                }
+            self.notifications_service.create_notifications(
+                dtos=[make_signing_notification(dto) for dto in created],
+            )
+            for dto in created:
+                self.visitor_service.remember(dto=dto)
+
+        registered = {dto.id for dto in created}
+        return [
+            dto
+            if dto.id in registered
+            else waitlisted[dto.id]
+            if dto.id in waitlisted
+            else DuplicateRegistrationError()
+            for dto in dtos
+        ]
+
+
+class VisitorImportService:
+    def __init__(
+        self,
+        repository: VisitorRepository,
+        seat_service: SeatService,
+        bloom: RegistrationBloomFilter,
+    ):
+        self.repository = repository
+        self.seat_service = seat_service
+        self.bloom = bloom
+
+    def import_csv(self, event_id: UUID, stream: IO) -> VisitorImportResultDTO:
+        with transaction.atomic():
+            free_seats = self.seat_service.lock_free_seats(event_id=event_id)
+            result = self.repository.import_csv(
+                event_id=event_id,
+                stream=stream,
+                topic=SIGNING_TOPIC,
+                limit=free_seats,
             )
-            self.notifications_service.create_notification(dto=notification_dto)
+            if free_seats is not None and result.imported:
+                self.seat_service.rebalance(event_id=event_id)
+            # Imported emails reach the Bloom filter through a rebuild
+            transaction.on_commit(partial(self.bloom.invalidate, [event_id]))
+        return result
@@ -0,0 +1,62 @@
+from dataclasses import replace
+from uuid import UUID, uuid4
+
+from celery import current_app
+from django.core.cache import cache
+
+from ..core.settings import EVENTS_REGISTRATION_TICKET_TTL
+from .dto import RegistrationTicketDTO, VisitorDTO
+
+
+class TicketStatus:
+    PENDING = "pending"
+    REGISTERED = "registered"
+    WAITLISTED = "waitlisted"
+    FAILED = "failed"
+
+
+class RegistrationTickets:
+    prefix = "events:registration_ticket"
+    task_name = "tasks.register_visitor"
+
+    def make_key(self, ticket_id: UUID) -> str:
+        return f"{self.prefix}:{ticket_id}"
+
+    def submit(self, dto: VisitorDTO) -> RegistrationTicketDTO:
+        ticket = RegistrationTicketDTO(
+            id=uuid4(),
+            event_id=dto.event_id,
+            status=TicketStatus.PENDING,
+        )
+        cache.set(
+            self.make_key(ticket.id),
+            ticket,
+            timeout=EVENTS_REGISTRATION_TICKET_TTL,
+        )
+        # Sent by name so the events app does not import the worker tasks.
+        # The visitor id is fixed here, so a redelivered task can recognise
+        # the row its first run committed.
+        current_app.send_task(
+            self.task_name,
+            kwargs={
+                "ticket_id": str(ticket.id),
+                "visitor_id": str(uuid4()),
+                "event_id": str(dto.event_id),
+                "full_name": dto.full_name,
+                "email": dto.email,
+            },
+        )
+        return ticket
+
+    def get(self, ticket_id: UUID) -> RegistrationTicketDTO | None:
+        return cache.get(self.make_key(ticket_id))
+
+    def resolve(self, ticket_id: UUID, status: str, error: str | None = None) -> None:
+        ticket = self.get(ticket_id)
+        if ticket is None:
+            return
+        cache.set(
+            self.make_key(ticket_id),
+            replace(ticket, status=status, error=error),
+            timeout=EVENTS_REGISTRATION_TICKET_TTL,
+        )
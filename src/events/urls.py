@@ -1,13 +1,60 @@
 from django.urls import path
 
 from .apps import EventsConfig
-from .views import EventAreaCreateAPI, EventCreateAPI, ListEventAPI, SignUpForEventAPI
+from .views import (
+    EventAreaCreateAPI,
+    EventAutocompleteAPI,
+    EventBulkCreateAPI,
+    EventCreateAPI,
+    EventExportAPI,
+    EventQueueStatusAPI,
+    EventVisitorsAPI,
+    EventVisitorsExportAPI,
+    GroupSignUpForEventAPI,
+    ListEventAPI,
+    RegistrationLookupAPI,
+    RegistrationTicketAPI,
+    SignUpForEventAPI,
+)
 
 app_name = EventsConfig.name
 
 urlpatterns = [
     path("list", ListEventAPI.as_view(), name="event-list"),
+    path("export", EventExportAPI.as_view(), name="event-export"),
+    path("autocomplete", EventAutocompleteAPI.as_view(), name="event-autocomplete"),
     path("", EventCreateAPI.as_view(), name="event-create"),
+    path("bulk", EventBulkCreateAPI.as_view(), name="event-bulk-create"),
     path("areas/", EventAreaCreateAPI.as_view(), name="event-area-create"),
+    path(
+        "registrations",
+        RegistrationLookupAPI.as_view(),
+        name="registration-lookup",
+    ),
+    path(
+        "registrations/<uuid:ticket_id>",
+        RegistrationTicketAPI.as_view(),
+        name="registration-ticket",
+    ),
     path("<uuid:event_id>/register", SignUpForEventAPI.as_view(), name="sign-up"),
+    path(
+        "<uuid:event_id>/register/group",
+        GroupSignUpForEventAPI.as_view(),
+        name="group-sign-up",
+    ),
+    path(
+        "<uuid:event_id>/visitors",
+        EventVisitorsAPI.as_view(),
+        name="event-visitors",
+    ),
+    path(
+        "<uuid:event_id>/visitors/export",
+        EventVisitorsExportAPI.as_view(),
+        name="event-visitors-export",
+    ),
+    path(
+        "<uuid:event_id>/queue",
+        EventQueueStatusAPI.as_view(),
+        name="event-queue-status",
+    ),
 ]
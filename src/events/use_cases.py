@@ -1,22 +1,157 @@
-from .dto import EventAreaDTO, EventDTO, VisitorDTO
+import hashlib
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from uuid import UUID
+
+from django.db import OperationalError
+
+from ..common.db import is_statement_timeout, statement_timeout
+from ..core.settings import (
+    EVENTS_AUTOCOMPLETE_CACHE_TTL,
+    EVENTS_AUTOCOMPLETE_TIMEOUT_MS,
+    EVENTS_EXPORT_CHUNK_SIZE,
+    EVENTS_LIST_CACHE_TTL,
+)
+from .cache import EventsCache
+from .dto import (
+    AdmissionDTO,
+    AutocompleteQueryDTO,
+    AutocompleteResultDTO,
+    BulkItemResultDTO,
+    EventAreaDTO,
+    EventDTO,
+    EventExportQueryDTO,
+    EventFilterDTO,
+    EventsStateDTO,
+    GroupMemberResultDTO,
+    GroupSignUpResultDTO,
+    RegistrationTicketDTO,
+    SignUpResultDTO,
+    SuggestionDTO,
+    VisitorDTO,
+    WaitlistEntryDTO,
+)
+from .exceptions import (
+    DuplicateRegistrationError,
+    EventNotFoundError,
+    InvalidQueueTokenError,
+    TicketNotFoundError,
+)
 from .serializers import (
     EventAreaResponseSerializer,
+    EventResponseEncoder,
     EventResponseSerializer,
+    VisitorRegistrationResponseEncoder,
+    VisitorResponseEncoder,
 )
-from .services import AreaService, EventsService, OutboxService
+from .services import AreaService, EventsService, OutboxService, VisitorService
+from .tickets import RegistrationTickets
+from .waiting_room import WaitingRoom
 
 
 class GetEventsUseCase:
-    def __init__(self, service: EventsService):
+    def __init__(self, service: EventsService, cache: EventsCache):
         self.service = service
+        self.cache = cache
+
+    def get_state(self) -> EventsStateDTO:
+        key = self.cache.make_key("list_state")
+        state = self.cache.get(key)
+        if state is None:
+            state = self.service.get_state()
+            self.cache.set(key, state, timeout=EVENTS_LIST_CACHE_TTL)
+        return state
+
+    def make_etag(self, state: EventsStateDTO, *params: str | None) -> str:
+        return hashlib.sha1(repr((state, params)).encode("utf-8")).hexdigest()
 
-    def get_queryset(self, name_filter: str | None = None, order_by: str | None = None):
-        return self.service.get_queryset(name_filter=name_filter, order_by=order_by)
+    def make_page_key(self, state: EventsStateDTO, *params: str | None) -> str:
+        return self.cache.make_key("list", state, *params)
 
-    def execute(self, queryset=None) -> EventResponseSerializer:
+    def get_cached_page(self, key: str) -> dict | None:
+        return self.cache.get(key)
+
+    def cache_page(self, key: str, page: dict) -> None:
+        self.cache.set(key, page, timeout=EVENTS_LIST_CACHE_TTL)
+
+    def get_queryset(
+        self,
+        name_filter: str | None = None,
+        order_by: str | None = None,
+        upcoming_from: datetime | None = None,
+        filters: EventFilterDTO | None = None,
+    ):
+        return self.service.get_queryset(
+            name_filter=name_filter,
+            order_by=order_by,
+            upcoming_from=upcoming_from,
+            filters=filters,
+        )
+
+    def execute(self, queryset=None) -> EventResponseEncoder:
         events = self.service.get_events(queryset=queryset)
-        serializer = EventResponseSerializer.from_dtos(dtos=events)
-        return serializer
+        return EventResponseEncoder.from_dtos(dtos=events)
+
+
+class ExportEventsUseCase:
+    def __init__(self, service: EventsService):
+        self.service = service
+
+    def execute(self, dto: EventExportQueryDTO) -> Iterator[dict]:
+        queryset = self.service.get_queryset(
+            name_filter=dto.name,
+            order_by=dto.order_by,
+        )
+        events = self.service.iter_events(
+            queryset=queryset,
+            chunk_size=EVENTS_EXPORT_CHUNK_SIZE,
+        )
+        return EventResponseEncoder.iter_encode(events)
+
+
+class ListVisitorsUseCase:
+    def __init__(self, events_service: EventsService, visitor_service: VisitorService):
+        self.events_service = events_service
+        self.visitor_service = visitor_service
+
+    def get_queryset(self, event_id: UUID):
+        if not self.events_service.exists(event_id=event_id):
+            raise EventNotFoundError
+        return self.visitor_service.get_event_queryset(event_id=event_id)
+
+    def execute(self, queryset) -> VisitorResponseEncoder:
+        visitors = self.visitor_service.get_visitors(queryset=queryset)
+        return VisitorResponseEncoder.from_dtos(dtos=visitors)
+
+
+class ExportVisitorsUseCase:
+    def __init__(self, events_service: EventsService, visitor_service: VisitorService):
+        self.events_service = events_service
+        self.visitor_service = visitor_service
+
+    def execute(self, event_id: UUID) -> Iterator[dict]:
+        if not self.events_service.exists(event_id=event_id):
+            raise EventNotFoundError
+        queryset = self.visitor_service.get_event_queryset(
+            event_id=event_id,
+        ).order_by("-registered_at", "-id")
+        visitors = self.visitor_service.iter_visitors(
+            queryset=queryset,
+            chunk_size=EVENTS_EXPORT_CHUNK_SIZE,
+        )
+        return VisitorResponseEncoder.iter_encode(visitors)
+
+
+class LookupRegistrationsUseCase:
+    def __init__(self, visitor_service: VisitorService):
+        self.visitor_service = visitor_service
+
+    def get_queryset(self, email: str):
+        return self.visitor_service.get_email_queryset(email=email)
+
+    def execute(self, queryset) -> VisitorRegistrationResponseEncoder:
+        registrations = self.visitor_service.get_registrations(queryset=queryset)
+        return VisitorRegistrationResponseEncoder.from_dtos(dtos=registrations)
 
 
 class CreateEventUseCase:
@@ -28,6 +163,43 @@ class CreateEventUseCase:
         return EventResponseSerializer.from_dto(dto=event)
 
 
+class BulkCreateEventsUseCase:
+    def __init__(self, events_service: EventsService, area_service: AreaService):
+        self.events_service = events_service
+        self.area_service = area_service
+
+    def execute(
+        self,
+        dtos: list[EventDTO | None],
+        errors: dict[int, dict],
+    ) -> list[BulkItemResultDTO]:
+        area_names = self.area_service.get_area_names(
+            ids={dto.area_id for dto in dtos if dto and dto.area_id},
+        )
+
+        results = []
+        pending = []
+        for index, dto in enumerate(dtos):
+            if dto is None:
+                results.append(BulkItemResultDTO(index=index, errors=errors[index]))
+            elif dto.area_id and dto.area_id not in area_names:
+                results.append(
+                    BulkItemResultDTO(
+                        index=index,
+                        errors={"area_id": ["Event area does not exist."]},
+                    ),
+                )
+            else:
+                pending.append((index, dto))
+
+        events = self.events_service.create_events(dtos=[dto for _, dto in pending])
+        for (index, _), event in zip(pending, events, strict=True):
+            event.area = area_names.get(event.area_id, "")
+            results.append(BulkItemResultDTO(index=index, event=event))
+
+        return sorted(results, key=lambda result: result.index)
+
+
 class CreateAreaUseCase:
     def __init__(self, service: AreaService):
         self.service = service
@@ -41,8 +213,160 @@ class SignUpForEventUseCase:
     def __init__(
         self,
         service: OutboxService,
+        events_service: EventsService,
+        cache: EventsCache,
+        waiting_room: WaitingRoom,
+        tickets: RegistrationTickets,
     ):
         self.service = service
+        self.events_service = events_service
+        self.cache = cache
+        self.waiting_room = waiting_room
+        self.tickets = tickets
+
+    def get_admission_rate(self, event_id: UUID) -> int:
+        key = self.cache.make_key("admission_rate", event_id)
+        rate = self.cache.get(key)
+        if rate is None:
+            rate = self.events_service.get_admission_rate(event_id=event_id) or 0
+            self.cache.set(key, rate, timeout=EVENTS_LIST_CACHE_TTL)
+        return rate
+
+    def admit(self, event_id: UUID, queue_token: str | None) -> AdmissionDTO:
+        rate = self.get_admission_rate(event_id=event_id)
+        if not rate:
+            return AdmissionDTO(admitted=True)
+        return self.waiting_room.enter(event_id=event_id, rate=rate, token=queue_token)
+
+    def execute(
+        self,
+        dto: VisitorDTO,
+        queue_token: str | None = None,
+        respond_async: bool = False,
+    ) -> SignUpResultDTO:
+        admission = self.admit(event_id=dto.event_id, queue_token=queue_token)
+        if not admission.admitted:
+            return SignUpResultDTO(admission=admission)
+        if respond_async:
+            return SignUpResultDTO(
+                admission=admission,
+                ticket=self.tickets.submit(dto=dto),
+            )
+        waitlist = self.service.register_visitor(visitor_dto=dto)
+        return SignUpResultDTO(admission=admission, waitlist=waitlist)
+
+
+class GroupSignUpForEventUseCase(SignUpForEventUseCase):
+    def execute(
+        self,
+        event_id: UUID,
+        dtos: list[VisitorDTO | None],
+        errors: dict[int, dict],
+        queue_token: str | None = None,
+    ) -> GroupSignUpResultDTO:
+        # The group passes the waiting room as one sign-up
+        admission = self.admit(event_id=event_id, queue_token=queue_token)
+        if not admission.admitted:
+            return GroupSignUpResultDTO(admission=admission)
+
+        valid = [(index, dto) for index, dto in enumerate(dtos) if dto is not None]
+        outcomes = (
+            self.service.register_group(
+                event_id=event_id,
+                visitor_dtos=[dto for _, dto in valid],
+            )
+            if valid
+            else []
+        )
+
+        members = {
+            index: GroupMemberResultDTO(index=index, errors=errors[index])
+            for index, dto in enumerate(dtos)
+            if dto is None
+        }
+        for (index, _), outcome in zip(valid, outcomes, strict=True):
+            if isinstance(outcome, VisitorDTO):
+                members[index] = GroupMemberResultDTO(index=index, visitor=outcome)
+            elif isinstance(outcome, WaitlistEntryDTO):
+                members[index] = GroupMemberResultDTO(index=index, waitlist=outcome)
+            else:
+                field = (
+                    "email"
+                    if isinstance(outcome, DuplicateRegistrationError)
+                    else "non_field_errors"
+                )
+                members[index] = GroupMemberResultDTO(
+                    index=index,
+                    errors={field: [str(outcome.detail)]},
+                )
+        return GroupSignUpResultDTO(
+            admission=admission,
+            members=[members[index] for index in sorted(members)],
+        )
+
+
+class RegistrationTicketUseCase:
+    def __init__(self, tickets: RegistrationTickets):
+        self.tickets = tickets
+
+    def execute(self, ticket_id: UUID) -> RegistrationTicketDTO:
+        ticket = self.tickets.get(ticket_id=ticket_id)
+        if ticket is None:
+            raise TicketNotFoundError
+        return ticket
+
+
+class QueueStatusUseCase:
+    def __init__(self, waiting_room: WaitingRoom):
+        self.waiting_room = waiting_room
+
+    def execute(self, event_id: UUID, queue_token: str | None) -> AdmissionDTO:
+        if not queue_token:
+            raise InvalidQueueTokenError
+        return self.waiting_room.status(event_id=event_id, token=queue_token)
+
+
+class AutocompleteUseCase:
+    def __init__(
+        self,
+        events_service: EventsService,
+        area_service: AreaService,
+        cache: EventsCache,
+    ):
+        self.events_service = events_service
+        self.area_service = area_service
+        self.cache = cache
+
+    def execute(self, dto: AutocompleteQueryDTO) -> AutocompleteResultDTO:
+        cache_key = self.cache.make_key("autocomplete", dto.term, dto.limit)
+        result = self.cache.get(cache_key)
+        if result is not None:
+            return result
+
+        events, events_complete = self._within_budget(
+            lambda: self.events_service.autocomplete(term=dto.term, limit=dto.limit),
+        )
+        areas, areas_complete = self._within_budget(
+            lambda: self.area_service.autocomplete(term=dto.term, limit=dto.limit),
+        )
+        result = AutocompleteResultDTO(
+            events=events,
+            areas=areas,
+            partial=not (events_complete and areas_complete),
+        )
+
+        if not result.partial:
+            self.cache.set(cache_key, result, timeout=EVENTS_AUTOCOMPLETE_CACHE_TTL)
+        return result
 
-    def execute(self, dto: VisitorDTO) -> None:
-        self.service.register_visitor(visitor_dto=dto)
+    @staticmethod
+    def _within_budget(
+        query: Callable[[], list[SuggestionDTO]],
+    ) -> tuple[list[SuggestionDTO], bool]:
+        try:
+            with statement_timeout(EVENTS_AUTOCOMPLETE_TIMEOUT_MS):
+                return query(), True
+        except OperationalError as exc:
+            if not is_statement_timeout(exc):
+                raise
+            return [], False
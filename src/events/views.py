@@ -1,34 +1,91 @@
+from datetime import datetime
 from urllib.request import Request
 from uuid import UUID
 
+from django.http import StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..common.idempotency import idempotent
 from ..common.response_factory import api_response_factory
+from ..core.settings import (
+    EVENTS_BULK_MAX_ITEMS,
+    EVENTS_GROUP_MAX_VISITORS,
+    EVENTS_LIST_MAX_AGE,
+)
 from .api_docs import (
+    bulk_create_events_docs,
     create_event_area_docs,
     create_event_docs,
+    event_autocomplete_docs,
+    event_queue_status_docs,
+    export_events_docs,
+    export_visitors_docs,
     get_events_docs,
+    group_sign_up_for_event_docs,
+    list_visitors_docs,
+    lookup_registrations_docs,
+    registration_ticket_docs,
     sign_up_for_event_docs,
 )
+from .counting import EventsCounter
+from .dto import AdmissionDTO, EventFilterDTO
+from .export import EXPORT_FORMATS, VISITOR_CSV_COLUMNS, write_csv
 from .ioc_container import get_container
+from .pagination import (
+    EventKeysetPagination,
+    EventLimitOffsetPagination,
+    VisitorKeysetPagination,
+)
 from .serializers import (
+    AdmissionResponseEncoder,
+    AutocompleteRequestSerializer,
+    AutocompleteResponseEncoder,
     EventAreaRequestSerializer,
+    EventBulkResponseEncoder,
+    EventExportRequestSerializer,
+    EventListFilterSerializer,
     EventRequestSerializer,
+    GroupSignUpResponseEncoder,
+    RegistrationLookupRequestSerializer,
+    RegistrationTicketResponseEncoder,
     SignUpForEventRequestSerializer,
+    WaitlistEntryResponseEncoder,
 )
 from .use_cases import (
+    AutocompleteUseCase,
+    BulkCreateEventsUseCase,
     CreateAreaUseCase,
     CreateEventUseCase,
+    ExportEventsUseCase,
+    ExportVisitorsUseCase,
     GetEventsUseCase,
+    GroupSignUpForEventUseCase,
+    ListVisitorsUseCase,
+    LookupRegistrationsUseCase,
+    QueueStatusUseCase,
+    RegistrationTicketUseCase,
     SignUpForEventUseCase,
 )
 
+QUEUE_TOKEN_HEADER = "X-Queue-Token"
+RESPOND_ASYNC = "respond-async"
+
 
 @create_event_area_docs
 class EventAreaCreateAPI(APIView):
+    @idempotent()
     def post(self, request: Request) -> Response:
         input_serializer = EventAreaRequestSerializer(data=request.data)
         if input_serializer.is_valid(raise_exception=True):
@@ -47,6 +104,7 @@ class EventAreaCreateAPI(APIView):
 
 @create_event_docs
 class EventCreateAPI(APIView):
+    @idempotent()
     def post(self, request: Request) -> Response:
         input_serializer = EventRequestSerializer(data=request.data)
         if input_serializer.is_valid(raise_exception=True):
@@ -63,49 +121,320 @@ class EventCreateAPI(APIView):
         )
 
 
+@bulk_create_events_docs
+class EventBulkCreateAPI(APIView):
+    @idempotent()
+    def post(self, request: Request) -> Response:
+        input_serializer = EventRequestSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=EVENTS_BULK_MAX_ITEMS,
+        )
+        input_serializer.is_valid(raise_exception=True)
+
+        container = get_container()
+        use_case: BulkCreateEventsUseCase = container.resolve(BulkCreateEventsUseCase)
+        results = use_case.execute(
+            dtos=input_serializer.to_dtos(),
+            errors=input_serializer.item_errors,
+        )
+
+        created = sum(result.event is not None for result in results)
+        failed = len(results) - created
+        if not failed:
+            status_code = status.HTTP_201_CREATED
+        elif created:
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        return api_response_factory(
+            serializer_class=EventBulkResponseEncoder.from_results(results=results),
+            meta={"created": created, "failed": failed},
+            status_code=status_code,
+        )
+
+
 @get_events_docs
 class ListEventAPI(APIView):
-    pagination_class = LimitOffsetPagination
+    pagination_class = EventLimitOffsetPagination
+    cursor_pagination_class = EventKeysetPagination
+    cache_params = (
+        "name",
+        "order_by",
+        "limit",
+        "offset",
+        "pagination",
+        "cursor",
+        "with_total",
+        "area_id",
+        "date_from",
+        "date_to",
+    )
     # permission_classes = [IsAuthenticated]
 
     def get(self, request: Request) -> Response:
+        filter_serializer = EventListFilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.to_dto()
+
         container = get_container()
         use_case: GetEventsUseCase = container.resolve(GetEventsUseCase)
 
+        upcoming_from = self._get_upcoming_from(request)
+        params = (
+            *(request.query_params.get(param) for param in self.cache_params),
+            upcoming_from,
+        )
+        state = use_case.get_state()
+        etag = quote_etag(use_case.make_etag(state, *params))
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self._set_cache_headers(not_modified, etag)
+
+        # The key is taken once, before querying, so a page built while a
+        # write commits is stored under the version that write invalidates
+        page_key = use_case.make_page_key(state, *params)
+        page = use_case.get_cached_page(page_key)
+        if page is None:
+            page = self._build_page(request, use_case, upcoming_from, filters)
+            use_case.cache_page(page_key, page)
+
+        response = api_response_factory(
+            data=page["data"],
+            pagination=page["pagination"],
+            status_code=status.HTTP_200_OK,
+        )
+        return self._set_cache_headers(response, etag)
+
+    @staticmethod
+    def _set_cache_headers(response: HttpResponseBase, etag: str) -> HttpResponseBase:
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=EVENTS_LIST_MAX_AGE)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def _build_page(
+        self,
+        request: Request,
+        use_case: GetEventsUseCase,
+        upcoming_from: datetime | None,
+        filters: EventFilterDTO,
+    ) -> dict:
         name_filter = request.query_params.get("name", None)
         order_by = request.query_params.get("order_by", None)
 
-        queryset = use_case.get_queryset(name_filter=name_filter, order_by=order_by)
+        queryset = use_case.get_queryset(
+            name_filter=name_filter,
+            order_by=order_by,
+            upcoming_from=upcoming_from,
+            filters=filters,
+        )
 
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(queryset, request)
+        counter = get_container().resolve(EventsCounter)
+        if self._is_cursor_mode(request):
+            paginator = self.cursor_pagination_class(counter=counter)
+            queryset = paginator.paginate_queryset(queryset, request)
+            pagination_data = paginator.get_pagination_data()
+        else:
+            paginator = self.pagination_class(counter=counter)
+            page = paginator.paginate_queryset(queryset, request)
+
+            if page is not None:
+                queryset = page
 
-        if page is not None:
-            queryset = page
+            pagination_data = {
+                "offset": paginator.offset,
+                "limit": paginator.limit,
+                **paginator.get_total_data(),
+            }
 
         serializer = use_case.execute(queryset=queryset)
+        return {"data": serializer.data, "pagination": pagination_data}
 
-        pagination_data = {
-            "offset": paginator.offset,
-            "limit": paginator.limit,
-            "total": paginator.count,
-        }
+    @staticmethod
+    def _is_cursor_mode(request: Request) -> bool:
+        return (
+            request.query_params.get("pagination") == "cursor"
+            or "cursor" in request.query_params
+        )
+
+    @staticmethod
+    def _get_upcoming_from(request: Request) -> datetime | None:
+        if not EventKeysetPagination.is_upcoming(request):
+            return None
+        # Truncated to the minute so the cutoff, and with it the cached page
+        # and ETag, stays stable between writes within that minute
+        return timezone.now().replace(second=0, microsecond=0)
+
+
+@event_autocomplete_docs
+class EventAutocompleteAPI(APIView):
+    def get(self, request: Request) -> Response:
+        input_serializer = AutocompleteRequestSerializer(data=request.query_params)
+        if input_serializer.is_valid(raise_exception=True):
+            container = get_container()
+            use_case: AutocompleteUseCase = container.resolve(AutocompleteUseCase)
+            result = use_case.execute(dto=input_serializer.to_dto())
+            return api_response_factory(
+                serializer_class=AutocompleteResponseEncoder.from_dto(dto=result),
+                meta={"partial": True} if result.partial else None,
+                status_code=status.HTTP_200_OK,
+            )
+        return api_response_factory(
+            errors=input_serializer.errors,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
 
+
+@export_events_docs
+class EventExportAPI(APIView):
+    batch_size = 500
+
+    def get(self, request: Request) -> HttpResponseBase:
+        input_serializer = EventExportRequestSerializer(data=request.query_params)
+        if input_serializer.is_valid(raise_exception=True):
+            dto = input_serializer.to_dto()
+            container = get_container()
+            use_case: ExportEventsUseCase = container.resolve(ExportEventsUseCase)
+            content_type, write = EXPORT_FORMATS[dto.export_format]
+            response = StreamingHttpResponse(
+                write(use_case.execute(dto=dto), batch_size=self.batch_size),
+                content_type=content_type,
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="events.{dto.export_format}"'
+            )
+            return response
         return api_response_factory(
-            serializer_class=serializer,
-            pagination=pagination_data,
+            errors=input_serializer.errors,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+
+@list_visitors_docs
+class EventVisitorsAPI(APIView):
+    permission_classes = [IsAdminUser]
+    pagination_class = VisitorKeysetPagination
+
+    def get(self, request: Request, event_id: UUID) -> Response:
+        container = get_container()
+        use_case: ListVisitorsUseCase = container.resolve(ListVisitorsUseCase)
+        paginator = self.pagination_class()
+        visitors = paginator.paginate_queryset(
+            use_case.get_queryset(event_id=event_id),
+            request,
+        )
+        return api_response_factory(
+            serializer_class=use_case.execute(queryset=visitors),
+            pagination=paginator.get_pagination_data(),
             status_code=status.HTTP_200_OK,
         )
 
 
+@lookup_registrations_docs
+class RegistrationLookupAPI(APIView):
+    permission_classes = [IsAdminUser]
+    pagination_class = VisitorKeysetPagination
+
+    def get(self, request: Request) -> Response:
+        input_serializer = RegistrationLookupRequestSerializer(
+            data=request.query_params,
+        )
+        if input_serializer.is_valid(raise_exception=True):
+            container = get_container()
+            use_case: LookupRegistrationsUseCase = container.resolve(
+                LookupRegistrationsUseCase,
+            )
+            paginator = self.pagination_class()
+            registrations = paginator.paginate_queryset(
+                use_case.get_queryset(email=input_serializer.validated_data["email"]),
+                request,
+            )
+            return api_response_factory(
+                serializer_class=use_case.execute(queryset=registrations),
+                pagination=paginator.get_pagination_data(),
+                status_code=status.HTTP_200_OK,
+            )
+        return api_response_factory(
+            errors=input_serializer.errors,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+
+@export_visitors_docs
+class EventVisitorsExportAPI(APIView):
+    permission_classes = [IsAdminUser]
+    batch_size = 500
+
+    def get(self, request: Request, event_id: UUID) -> HttpResponseBase:
+        container = get_container()
+        use_case: ExportVisitorsUseCase = container.resolve(ExportVisitorsUseCase)
+        response = StreamingHttpResponse(
+            write_csv(
+                use_case.execute(event_id=event_id),
+                batch_size=self.batch_size,
+                columns=VISITOR_CSV_COLUMNS,
+            ),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="visitors-{event_id}.csv"'
+        )
+        return response
+
+
+def _queued_response(admission: AdmissionDTO, status_code: int) -> Response:
+    response = api_response_factory(
+        serializer_class=AdmissionResponseEncoder.from_dto(dto=admission),
+        meta={"message": "Waiting for admission"},
+        status_code=status_code,
+    )
+    response[QUEUE_TOKEN_HEADER] = admission.token
+    response["Retry-After"] = str(admission.retry_after)
+    return response
+
+
 @sign_up_for_event_docs
 class SignUpForEventAPI(APIView):
+    @idempotent(vary=(QUEUE_TOKEN_HEADER, "Prefer"))
     def post(self, request: Request, event_id: UUID) -> Response:
         input_serializer = SignUpForEventRequestSerializer(data=request.data)
         if input_serializer.is_valid(raise_exception=True):
             container = get_container()
             use_case: SignUpForEventUseCase = container.resolve(SignUpForEventUseCase)
-            use_case.execute(dto=input_serializer.to_dto(event_id=event_id))
+            respond_async = RESPOND_ASYNC in request.headers.get("Prefer", "")
+            result = use_case.execute(
+                dto=input_serializer.to_dto(event_id=event_id),
+                queue_token=request.headers.get(QUEUE_TOKEN_HEADER),
+                respond_async=respond_async,
+            )
+            if not result.admission.admitted:
+                return _queued_response(result.admission, status.HTTP_202_ACCEPTED)
+            if result.ticket is not None:
+                response = api_response_factory(
+                    serializer_class=RegistrationTicketResponseEncoder.from_dto(
+                        dto=result.ticket,
+                    ),
+                    meta={"message": "Registration accepted"},
+                    status_code=status.HTTP_202_ACCEPTED,
+                )
+                response["Preference-Applied"] = RESPOND_ASYNC
+                response["Location"] = reverse(
+                    "events:registration-ticket",
+                    kwargs={"ticket_id": result.ticket.id},
+                )
+                return response
+            if result.waitlist is not None:
+                return api_response_factory(
+                    serializer_class=WaitlistEntryResponseEncoder.from_dto(
+                        dto=result.waitlist,
+                    ),
+                    meta={"message": "Event is full, added to the waitlist"},
+                    status_code=status.HTTP_202_ACCEPTED,
+                )
             return api_response_factory(
                 status_code=status.HTTP_201_CREATED,
                 meta={"message": "Successful registration"},
@@ -114,3 +443,83 @@ class SignUpForEventAPI(APIView):
             errors=input_serializer.errors,
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
+
+
+@group_sign_up_for_event_docs
+class GroupSignUpForEventAPI(APIView):
+    @idempotent(vary=(QUEUE_TOKEN_HEADER,))
+    def post(self, request: Request, event_id: UUID) -> Response:
+        input_serializer = SignUpForEventRequestSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=EVENTS_GROUP_MAX_VISITORS,
+        )
+        input_serializer.is_valid(raise_exception=True)
+
+        container = get_container()
+        use_case: GroupSignUpForEventUseCase = container.resolve(
+            GroupSignUpForEventUseCase,
+        )
+        result = use_case.execute(
+            event_id=event_id,
+            dtos=input_serializer.to_dtos(event_id=event_id),
+            errors=input_serializer.item_errors,
+            queue_token=request.headers.get(QUEUE_TOKEN_HEADER),
+        )
+        if not result.admission.admitted:
+            return _queued_response(result.admission, status.HTTP_202_ACCEPTED)
+
+        registered = sum(member.visitor is not None for member in result.members)
+        waitlisted = sum(member.waitlist is not None for member in result.members)
+        failed = len(result.members) - registered - waitlisted
+        if registered == len(result.members):
+            status_code = status.HTTP_201_CREATED
+        elif waitlisted == len(result.members):
+            status_code = status.HTTP_202_ACCEPTED
+        elif failed == len(result.members):
+            status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        else:
+            status_code = status.HTTP_207_MULTI_STATUS
+
+        return api_response_factory(
+            serializer_class=GroupSignUpResponseEncoder.from_members(
+                members=result.members,
+            ),
+            meta={"registered": registered, "waitlisted": waitlisted, "failed": failed},
+            status_code=status_code,
+        )
+
+
+@event_queue_status_docs
+class EventQueueStatusAPI(APIView):
+    def get(self, request: Request, event_id: UUID) -> Response:
+        container = get_container()
+        use_case: QueueStatusUseCase = container.resolve(QueueStatusUseCase)
+        admission = use_case.execute(
+            event_id=event_id,
+            queue_token=request.headers.get(QUEUE_TOKEN_HEADER),
+        )
+        if not admission.admitted:
+            return _queued_response(admission, status.HTTP_200_OK)
+        response = api_response_factory(
+            serializer_class=AdmissionResponseEncoder.from_dto(dto=admission),
+            meta={"message": "Admitted, repeat the registration with the token"},
+            status_code=status.HTTP_200_OK,
+        )
+        response[QUEUE_TOKEN_HEADER] = admission.token
+        return response
+
+
+@registration_ticket_docs
+class RegistrationTicketAPI(APIView):
+    def get(self, request: Request, ticket_id: UUID) -> Response:
+        container = get_container()
+        use_case: RegistrationTicketUseCase = container.resolve(
+            RegistrationTicketUseCase,
+        )
+        ticket = use_case.execute(ticket_id=ticket_id)
+        return api_response_factory(
+            serializer_class=RegistrationTicketResponseEncoder.from_dto(dto=ticket),
+            status_code=status.HTTP_200_OK,
+        )
@@ -0,0 +1,147 @@
+import math
+from uuid import UUID
+
+from django.core import signing
+
+from ..common.redis import get_redis_client
+from ..core.settings import (
+    EVENTS_WAITING_ROOM_MAX_QUEUE,
+    EVENTS_WAITING_ROOM_TOKEN_TTL,
+)
+from .dto import AdmissionDTO
+from .exceptions import InvalidQueueTokenError, WaitingRoomFullError
+
+# Advances the head of the queue by the seconds elapsed times the rate, then
+# optionally hands out the next ticket. The head may run up to one second of
+# admissions ahead of the tail, so an idle room admits a burst right away.
+# Returns {head, tail, ticket, rate}; ticket is 0 when none was handed out
+# and -1 when the queue is full.
+ADVANCE_SCRIPT = """
+local room = redis.call('HMGET', KEYS[1], 'head', 'tail', 'rate', 'updated')
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local rate = tonumber(ARGV[1]) or tonumber(room[3])
+if not rate then
+    return {0, 0, 0, 0}
+end
+local head = tonumber(room[1]) or 0
+local tail = tonumber(room[2]) or 0
+local updated = tonumber(room[4]) or now
+local burst = math.max(rate, 1)
+
+local admitted = math.floor((now - updated) * rate / 1000)
+if admitted > 0 then
+    if head + admitted >= tail + burst then
+        head = tail + burst
+        updated = now
+    else
+        head = head + admitted
+        updated = updated + math.floor(admitted * 1000 / rate)
+    end
+end
+if not room[4] then
+    head = burst
+end
+
+local ticket = 0
+if ARGV[2] == '1' then
+    if tail - head >= tonumber(ARGV[3]) then
+        ticket = -1
+    else
+        tail = tail + 1
+        ticket = tail
+    end
+end
+redis.call('HSET', KEYS[1], 'head', head, 'tail', tail, 'rate', rate, 'updated', updated)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {head, tail, ticket, rate}
+"""
+
+
+class WaitingRoom:
+    prefix = "events:waiting_room"
+    salt = "events.waiting_room"
+
+    def __init__(self):
+        self.client = get_redis_client()
+        self.advance = self.client.register_script(ADVANCE_SCRIPT)
+
+    def room_key(self, event_id: UUID) -> str:
+        return f"{self.prefix}:{event_id}"
+
+    def used_key(self, event_id: UUID, ticket: int) -> str:
+        return f"{self.prefix}:{event_id}:used:{ticket}"
+
+    def make_token(self, event_id: UUID, ticket: int) -> str:
+        return signing.dumps([str(event_id), ticket], salt=self.salt)
+
+    def read_token(self, event_id: UUID, token: str) -> int:
+        try:
+            token_event_id, ticket = signing.loads(
+                token,
+                salt=self.salt,
+                max_age=EVENTS_WAITING_ROOM_TOKEN_TTL,
+            )
+        except signing.BadSignature:
+            raise InvalidQueueTokenError
+        if token_event_id != str(event_id):
+            raise InvalidQueueTokenError
+        return ticket
+
+    def enter(self, event_id: UUID, rate: int, token: str | None) -> AdmissionDTO:
+        ticket = self.read_token(event_id, token) if token else None
+        head, _, issued, rate = self.advance(
+            keys=[self.room_key(event_id)],
+            args=[
+                rate,
+                "0" if ticket else "1",
+                EVENTS_WAITING_ROOM_MAX_QUEUE,
+                EVENTS_WAITING_ROOM_TOKEN_TTL,
+            ],
+        )
+        if issued == -1:
+            raise WaitingRoomFullError(
+                wait=self._wait(EVENTS_WAITING_ROOM_MAX_QUEUE, rate)
+            )
+        ticket = ticket or issued
+        if ticket > head:
+            return self._queued(event_id, ticket, head, rate)
+
+        # Each admitted ticket lets exactly one request through
+        used = self.client.set(
+            self.used_key(event_id, ticket),
+            1,
+            nx=True,
+            ex=EVENTS_WAITING_ROOM_TOKEN_TTL,
+        )
+        if not used:
+            raise InvalidQueueTokenError
+        return AdmissionDTO(admitted=True)
+
+    def status(self, event_id: UUID, token: str) -> AdmissionDTO:
+        ticket = self.read_token(event_id, token)
+        head, _, _, rate = self.advance(
+            keys=[self.room_key(event_id)],
+            args=["", "0", 0, EVENTS_WAITING_ROOM_TOKEN_TTL],
+        )
+        if not rate:
+            # The room expired together with every ticket it handed out
+            raise InvalidQueueTokenError
+        if ticket > head:
+            return self._queued(event_id, ticket, head, rate)
+        return AdmissionDTO(admitted=True, token=token)
+
+    def _queued(
+        self, event_id: UUID, ticket: int, head: int, rate: int
+    ) -> AdmissionDTO:
+        position = ticket - head
+        return AdmissionDTO(
+            admitted=False,
+            token=self.make_token(event_id, ticket),
+            position=position,
+            retry_after=self._wait(position, rate),
+        )
+
+    @staticmethod
+    def _wait(position: int, rate: int) -> int:
+        return max(1, math.ceil(position / rate))
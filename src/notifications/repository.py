@@ -15,3 +15,8 @@ class NotificationsRepository:
             obj.save()
         except Exception:
             raise
+
+    def bulk_create(self, dtos: list[NotificationDTO]) -> None:
+        self.model.objects.bulk_create(
+            self.model(topic=dto.topic, payload=dto.payload) for dto in dtos
+        )
@@ -7,6 +7,8 @@ from .repository import NotificationsRepository
 class NotificationsServiceProtocol(Protocol):
     def create_notification(self, dto: NotificationDTO) -> None: ...
 
+    def create_notifications(self, dtos: list[NotificationDTO]) -> None: ...
+
 
 class NotificationsService:
     def __init__(self, repository: NotificationsRepository):
@@ -14,3 +16,6 @@ class NotificationsService:
 
     def create_notification(self, dto: NotificationDTO) -> None:
         self.repository.create(dto=dto)
+
+    def create_notifications(self, dtos: list[NotificationDTO]) -> None:
+        self.repository.bulk_create(dtos=dtos)
@@ -8,6 +8,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
+from src.events.cache import EventsCache
 from src.events.models import EventAreaModel, EventModel
 from src.sync.models import SyncResultsModel
 
@@ -91,6 +92,8 @@ class Command(BaseCommand):
                 self.style.ERROR(f"Sync failed: {str(e)}"),
             )
             raise CommandError(f"Synchronization failed: {str(e)}")
+        finally:
+            EventsCache().bump_version()
 
     def _fetch_events(self, url: str) -> list[dict]:
         try:
@@ -5,17 +5,32 @@ import time
 from datetime import timedelta
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
+from uuid import UUID
 
 from celery import shared_task
-from django.db import transaction
+from django.db import OperationalError, transaction
 from django.utils import timezone
 
+from ..common.exceptions import BaseServiceException
 from ..core.settings import (
+    EVENTS_CLOSE_BATCH_SIZE,
+    EVENTS_WAITLIST_BATCH_SIZE,
     NOTIFICATION_SERVICE_OWNER_ID,
     NOTIFICATION_SERVICE_URL,
     NOTIFICATION_TOKEN,
 )
+from ..events.cache import EventsCache
+from ..events.dto import VisitorDTO
+from ..events.exceptions import DuplicateRegistrationError
+from ..events.ioc_container import get_container
 from ..events.models import EventModel
+from ..events.services import (
+    EventsService,
+    OutboxService,
+    VisitorService,
+    WaitlistService,
+)
+from ..events.tickets import RegistrationTickets, TicketStatus
 from ..notifications.models import NotificationModel
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
@@ -26,6 +41,7 @@ MAX_NOTIFICATION_ATTEMPTS = 5
 BASE_BACKOFF_SECONDS = 1.0
 MAX_BACKOFF_SECONDS = 30.0
 REQUEST_TIMEOUT_SECONDS = 5.0
+MAX_REGISTRATION_RETRIES = 3
 
 
 @shared_task(name="tasks.delete_old_events", queue="periodic")
@@ -38,6 +54,8 @@ def delete_old_events(days: int = 7) -> int:
     deleted_count, deleted_objects = EventModel.objects.filter(
         event_datetime__lt=cutoff_date,
     ).delete()
+    if deleted_count:
+        EventsCache().bump_version()
 
     logger.info(
         f"Deleted {deleted_count} event(s). "
@@ -47,6 +65,96 @@ def delete_old_events(days: int = 7) -> int:
     return deleted_count
 
 
+@shared_task(name="tasks.close_expired_events", queue="periodic")
+def close_expired_events(batch_size: int = EVENTS_CLOSE_BATCH_SIZE) -> int:
+    events_service = get_container().resolve(EventsService)
+    closed_count = events_service.close_expired(batch_size=batch_size)
+    if closed_count:
+        logger.info(f"Closed {closed_count} event(s) past their deadline")
+    return closed_count
+
+
+@shared_task(name="tasks.promote_waitlist", queue="periodic")
+def promote_waitlist(batch_size: int = EVENTS_WAITLIST_BATCH_SIZE) -> int:
+    waitlist_service = get_container().resolve(WaitlistService)
+    promoted_count = waitlist_service.promote(batch_size=batch_size)
+    if promoted_count:
+        logger.info(f"Promoted {promoted_count} visitor(s) from waitlists")
+    return promoted_count
+
+
+@shared_task(
+    bind=True,
+    name="tasks.register_visitor",
+    queue="registrations",
+    acks_late=True,
+    max_retries=MAX_REGISTRATION_RETRIES,
+)
+def register_visitor(
+    self,
+    ticket_id: str,
+    event_id: str,
+    full_name: str,
+    email: str,
+    visitor_id: str | None = None,
+) -> str:
+    tickets = RegistrationTickets()
+    ticket = tickets.get(ticket_id=ticket_id)
+    if ticket is not None and ticket.status != TicketStatus.PENDING:
+        # Redelivered after the registration was already processed
+        return ticket.status
+
+    container = get_container()
+    outbox = container.resolve(OutboxService)
+    try:
+        waitlist = outbox.register_visitor(
+            visitor_dto=VisitorDTO(
+                id=UUID(visitor_id) if visitor_id else None,
+                event_id=UUID(event_id),
+                full_name=full_name,
+                email=email,
+            ),
+        )
+    except BaseServiceException as exc:
+        # A redelivery after the first run committed finds its own visitor row
+        if not (
+            isinstance(exc, DuplicateRegistrationError)
+            and visitor_id
+            and container.resolve(VisitorService).exists(visitor_id=UUID(visitor_id))
+        ):
+            tickets.resolve(
+                ticket_id=ticket_id,
+                status=TicketStatus.FAILED,
+                error=str(exc.detail),
+            )
+            return TicketStatus.FAILED
+        waitlist = None
+    except OperationalError as exc:
+        if self.request.retries >= self.max_retries:
+            tickets.resolve(
+                ticket_id=ticket_id,
+                status=TicketStatus.FAILED,
+                error="Registration could not be processed",
+            )
+            raise
+        logger.warning(
+            "Registration ticket %s failed (%s). Retry %s/%s",
+            ticket_id,
+            exc,
+            self.request.retries + 1,
+            self.max_retries,
+        )
+        raise self.retry(
+            exc=exc, countdown=_calculate_backoff(self.request.retries + 1)
+        )
+
+    ticket_status = (
+        TicketStatus.REGISTERED if waitlist is None else TicketStatus.WAITLISTED
+    )
+    tickets.resolve(ticket_id=ticket_id, status=ticket_status)
+    return ticket_status
+
+
 def run_notifications_outbox_loop(sleep_interval: float = 1.0):
     notification_api_url = NOTIFICATION_SERVICE_URL
     notification_token = NOTIFICATION_TOKEN